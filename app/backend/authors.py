@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam
+from sqlalchemy.engine import Connection
+from sqlmodel import text
+
+from app.backend.db import chunked
+from app.backend.models import Author
+
+
+# -------------------------------------------------------------------
+# Name normalization
+# -------------------------------------------------------------------
+
+_SPLIT_RE = re.compile(r"\s*;\s*|\s+and\s+|\s*&\s*", re.IGNORECASE)
+_MARKER_RE = re.compile(r"[\d*†‡§¶]+$")   # trailing affiliation markers
+
+
+def normalize_author(name: str) -> str:
+    """
+    Normalize one author name to "First Last" display form.
+
+    - collapses whitespace
+    - drops trailing affiliation markers (digits, *, †)
+    - reorders "Last, First"
+    - title-cases all-upper / all-lower names
+    """
+    name = " ".join((name or "").split())
+    name = _MARKER_RE.sub("", name).strip(" ,")
+
+    if "," in name:
+        last, first = name.split(",", 1)
+        name = f"{first.strip()} {last.strip()}".strip()
+
+    if name.isupper() or name.islower():
+        name = name.title()
+
+    return name
+
+
+def split_authors(raw: str) -> List[str]:
+    """
+    Split an author string into normalized names.
+
+    Handles ";", " and ", "&" separators, "Last, First" entries and
+    comma-separated "First Last, First Last" lists.
+    """
+    if not raw:
+        return []
+
+    names: List[str] = []
+    for part in _SPLIT_RE.split(raw):
+        pieces = [p.strip() for p in part.split(",") if p.strip()]
+        if len(pieces) > 2 or (len(pieces) == 2 and all(" " in p for p in pieces)):
+            names.extend(pieces)
+        elif pieces:
+            names.append(part)
+
+    normalized = [normalize_author(n) for n in names]
+    return list(dict.fromkeys(n for n in normalized if n))
+
+
+def author_key(name: str) -> str:
+    """
+    Lookup key for the in-memory author map.
+    """
+    return name.lower()
+
+
+# -------------------------------------------------------------------
+# Bulk upsert
+# -------------------------------------------------------------------
+
+def load_author_ids(conn: Connection) -> Dict[str, int]:
+    """
+    Load the author key -> id map once per ingest / import run.
+    """
+    author_ids: Dict[str, int] = {}
+    for author_id, name in conn.execute(text("SELECT id, name FROM author ORDER BY id")):
+        author_ids.setdefault(author_key(name), author_id)
+    return author_ids
+
+
+def upsert_authors(
+    conn: Connection,
+    names: Iterable[str],
+    author_ids: Dict[str, int],
+) -> None:
+    """
+    Insert authors missing from `author_ids` and add their ids to it.
+    """
+    missing: Dict[str, str] = {}
+    for name in names:
+        key = author_key(name)
+        if key not in author_ids:
+            missing.setdefault(key, name)
+
+    if not missing:
+        return
+
+    conn.execute(Author.__table__.insert(), [{"name": n} for n in missing.values()])
+
+    lookup = text("SELECT id, name FROM author WHERE name IN :names").bindparams(
+        bindparam("names", expanding=True)
+    )
+    for chunk in chunked(list(missing.values())):
+        for author_id, name in conn.execute(lookup, {"names": chunk}):
+            author_ids.setdefault(author_key(name), author_id)
+
+
+def link_paper_authors(
+    conn: Connection,
+    links: List[Tuple[str, str]],
+    author_ids: Dict[str, int],
+) -> int:
+    """
+    Bulk link (paper_id, author name) pairs, creating authors as needed.
+
+    Returns the number of links written.
+    """
+    if not links:
+        return 0
+
+    upsert_authors(conn, (name for _, name in links), author_ids)
+
+    conn.execute(
+        text(
+            "INSERT OR IGNORE INTO paperauthor(paper_id, author_id) "
+            "VALUES (:paper_id, :author_id)"
+        ),
+        [
+            {"paper_id": paper_id, "author_id": author_ids[author_key(name)]}
+            for paper_id, name in links
+        ],
+    )
+    return len(links)
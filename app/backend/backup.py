@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.backend.db import engine, library_path
+from app.backend.hashing import sha256_file
+
+
+# Pages copied per restore step
+BACKUP_STEP_PAGES = 1024
+
+
+def manifest_path(path: Path) -> Path:
+    return path.with_name(path.name + ".manifest.json")
+
+
+def _throughput(size: int, seconds: float) -> float:
+    return round(size / (1024 * 1024) / seconds, 1) if seconds > 0 else 0.0
+
+
+# -------------------------------------------------------------------
+# Backup
+# -------------------------------------------------------------------
+
+def backup_db(
+    dest: Path,
+    compact: bool = False,
+    source: Optional[Path] = None,
+) -> Dict:
+    """
+    Snapshot the live database without stopping the server.
+
+    - default: SQLite online backup API, all pages in one step
+    - compact: `VACUUM INTO` (single pass, compacted output)
+
+    Both copy under one read transaction, so writers wait (busy timeout)
+    until the copy is done. A stepped backup would let them in between
+    steps, but the library is not in WAL mode, so every write from
+    another connection restarts the backup from the first page and a
+    busy server can keep it from ever finishing.
+
+    The snapshot is written to a temp file, integrity-checked, moved into
+    place and described by a checksum manifest (<dest>.manifest.json).
+    `source` defaults to the current library.
+    """
+    source = source or library_path()
+    dest = dest.resolve()
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + ".partial")
+    if tmp.exists():
+        tmp.unlink()
+
+    start = time.perf_counter()
+
+    src = sqlite3.connect(str(source))
+    try:
+        if compact:
+            src.execute("VACUUM INTO ?", (str(tmp),))
+        else:
+            dst = sqlite3.connect(str(tmp))
+            try:
+                src.backup(dst, pages=-1)
+            finally:
+                dst.close()
+    finally:
+        src.close()
+
+    elapsed = time.perf_counter() - start
+
+    check = sqlite3.connect(str(tmp))
+    try:
+        integrity = check.execute("PRAGMA quick_check").fetchone()[0]
+        page_count = check.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        check.close()
+
+    if integrity != "ok":
+        tmp.unlink()
+        raise RuntimeError(f"Backup failed integrity check: {integrity}")
+
+    os.replace(tmp, dest)
+
+    size = dest.stat().st_size
+    manifest = {
+        "file": dest.name,
+        "source": str(source),
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "mode": "vacuum_into" if compact else "online_backup",
+        "size_bytes": size,
+        "page_count": page_count,
+        "sha256": sha256_file(dest),
+    }
+    manifest_path(dest).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    return {
+        **manifest,
+        "path": str(dest),
+        "seconds": round(elapsed, 3),
+        "mb_per_s": _throughput(size, elapsed),
+    }
+
+
+# -------------------------------------------------------------------
+# Restore
+# -------------------------------------------------------------------
+
+def verify_backup(path: Path) -> Optional[bool]:
+    """
+    Check a backup against its manifest checksum.
+
+    Returns None when there is no manifest.
+    """
+    mpath = manifest_path(path)
+    if not mpath.exists():
+        return None
+
+    manifest = json.loads(mpath.read_text(encoding="utf-8"))
+    return manifest.get("sha256") == sha256_file(path)
+
+
+def restore_db(
+    src_path: Path,
+    verify: bool = True,
+    pages: int = BACKUP_STEP_PAGES,
+    target: Optional[Path] = None,
+) -> Dict:
+    """
+    Replace the library database with a backup.
+
+    Uses the backup API in the other direction, so the target is
+    overwritten under SQLite's own locking. Stop the server first:
+    open connections would see the library change underneath them.
+    `target` defaults to the current library.
+    """
+    target = target or library_path()
+    src_path = src_path.resolve()
+    if not src_path.exists():
+        raise FileNotFoundError(str(src_path))
+
+    if verify and verify_backup(src_path) is False:
+        raise ValueError(f"Checksum mismatch: {src_path}")
+
+    # Drop pooled connections of this process before overwriting
+    engine.dispose()
+
+    start = time.perf_counter()
+
+    src = sqlite3.connect(str(src_path))
+    dst = sqlite3.connect(str(target))
+    try:
+        src.backup(dst, pages=pages)
+    finally:
+        dst.close()
+        src.close()
+
+    elapsed = time.perf_counter() - start
+    size = src_path.stat().st_size
+
+    return {
+        "path": str(target),
+        "size_bytes": size,
+        "seconds": round(elapsed, 3),
+        "mb_per_s": _throughput(size, elapsed),
+    }
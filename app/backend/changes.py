@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.engine import Connection
+from sqlmodel import text
+
+from app.backend.db import engine
+from app.backend.models import ChangeLog
+
+
+# Longest accepted long-poll wait (seconds)
+MAX_WAIT = 30.0
+
+# Poll interval while waiting for new changes
+POLL_INTERVAL = 0.25
+
+
+# -------------------------------------------------------------------
+# Writing
+# -------------------------------------------------------------------
+
+def change(entity: str, entity_id: object, op: str, **data) -> Dict:
+    """
+    One change row; None-valued fields are left out of the delta.
+    """
+    return {
+        "entity": entity,
+        "entity_id": str(entity_id),
+        "op": op,
+        "data": {k: v for k, v in data.items() if v is not None},
+    }
+
+
+def paper_created(paper: Dict) -> Dict:
+    return change(
+        "paper",
+        paper["id"],
+        "create",
+        title=paper.get("title"),
+        year=paper.get("year"),
+        venue=paper.get("venue") or None,
+        doi=paper.get("doi"),
+        arxiv_id=paper.get("arxiv_id"),
+        authors=paper.get("authors") or None,
+    )
+
+
+def record_changes(conn: Connection, changes: Iterable[Dict]) -> None:
+    """
+    Append changes in the caller's transaction (caller commits),
+    so the feed never shows a write that was rolled back.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {**c, "at": now, "data": json.dumps(c["data"], separators=(",", ":"))}
+        for c in changes
+    ]
+    if rows:
+        conn.execute(ChangeLog.__table__.insert(), rows)
+
+
+# -------------------------------------------------------------------
+# Reading
+# -------------------------------------------------------------------
+
+def latest_seq(ops: Optional[Iterable[str]] = None) -> int:
+    """
+    Seq of the newest change (of one of `ops`, when given).
+
+    Per-op maxima use the `op` index, so this stays O(log n).
+    """
+    with engine.connect() as conn:
+        if ops is None:
+            return conn.execute(text("SELECT MAX(seq) FROM changelog")).scalar() or 0
+
+        params = {f"op{i}": op for i, op in enumerate(ops)}
+        maxima = " UNION ALL ".join(
+            f"SELECT MAX(seq) AS seq FROM changelog WHERE op = :{k}" for k in params
+        )
+        return conn.execute(text(f"SELECT MAX(seq) FROM ({maxima})"), params).scalar() or 0
+
+
+def list_changes(since: int = 0, limit: int = 1000) -> Dict:
+    """
+    Changes with seq > `since`, oldest first.
+
+    `next` is the cursor for the following call.
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT seq, at, entity, entity_id, op, data
+                FROM changelog
+                WHERE seq > :since
+                ORDER BY seq
+                LIMIT :limit;
+                """
+            ),
+            {"since": since, "limit": limit},
+        ).mappings().all()
+
+    changes: List[Dict] = [{**r, "data": json.loads(r["data"] or "{}")} for r in rows]
+    return {
+        "changes": changes,
+        "next": changes[-1]["seq"] if changes else since,
+        "more": len(changes) == limit,
+    }
+
+
+def changed_papers(
+    conn: Connection, since: Optional[int], ops: Iterable[str]
+) -> Tuple[Optional[Set[str]], int]:
+    """
+    Papers touched by `ops` in changes after seq `since`, and the seq the
+    caller resumes from next time.
+
+    Derived indexes (dedup candidates, vectors, related lists) keep this
+    seq as their mark: records are written in the transaction of the
+    write itself and SQLite serializes writers, so seq follows commit
+    order and, unlike an `updated_at` mark, cannot skip a late commit.
+    `since=None` returns None for "everything" (first, full pass).
+    """
+    upto = conn.execute(text("SELECT COALESCE(MAX(seq), 0) FROM changelog")).scalar()
+    if since is None:
+        return None, upto
+
+    ops = list(ops)
+    params = {f"op{i}": op for i, op in enumerate(ops)}
+    rows = conn.execute(
+        text(
+            f"""
+            SELECT entity, entity_id, op, data
+            FROM changelog
+            WHERE seq > :since AND seq <= :upto
+              AND op IN ({", ".join(":" + k for k in params)});
+            """
+        ),
+        {"since": since, "upto": upto, **params},
+    )
+
+    ids: Set[str] = set()
+    for entity, entity_id, op, data in rows:
+        if op == "merge":
+            # The duplicate is gone; the canonical paper gained its links
+            ids.add(json.loads(data)["into"])
+        elif op == "add_paper":
+            ids.add(json.loads(data)["paper_id"])
+        elif entity == "paper":
+            ids.add(entity_id)
+    return ids, upto
+
+
+async def poll_changes(since: int = 0, limit: int = 1000, wait: Optional[float] = None) -> Dict:
+    """
+    Long-poll: return as soon as there are changes past `since`,
+    or an empty page after `wait` seconds (at most MAX_WAIT).
+
+    Queries run in a worker thread, so waiting never blocks the event loop.
+    """
+    deadline = time.monotonic() + min(max(wait or 0.0, 0.0), MAX_WAIT)
+    while True:
+        page = await asyncio.to_thread(list_changes, since, limit)
+        if page["changes"] or time.monotonic() >= deadline:
+            return page
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+def wait_for_changes(since: int = 0, limit: int = 1000, wait: Optional[float] = None) -> Dict:
+    """
+    Blocking poll_changes (CLI).
+    """
+    return asyncio.run(poll_changes(since, limit, wait))
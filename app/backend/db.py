@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import re
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Iterator
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
 
-from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel, Session, create_engine, text
 
 
 # -------------------------------------------------------------------
@@ -18,16 +23,144 @@ DATA_DIR.mkdir(exist_ok=True)
 DB_PATH = DATA_DIR / "db.sqlite"
 DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+# Additional libraries: data/libraries/<name>/db.sqlite
+# (the default library keeps data/db.sqlite)
+LIBRARIES_DIR = DATA_DIR / "libraries"
+DEFAULT_LIBRARY = "default"
+
+_LIBRARY_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def library_dir(name: str) -> Path:
+    """
+    Directory holding a library's database and derived files.
+    """
+    if name == DEFAULT_LIBRARY:
+        return DATA_DIR
+    if not _LIBRARY_NAME_RE.match(name):
+        raise ValueError(f"Invalid library name: {name!r}")
+    return LIBRARIES_DIR / name
+
+
+def list_libraries() -> List[str]:
+    """
+    Names of the libraries on disk (default first).
+    """
+    names = [DEFAULT_LIBRARY]
+    if LIBRARIES_DIR.exists():
+        names += sorted(
+            p.name for p in LIBRARIES_DIR.iterdir() if (p / "db.sqlite").exists()
+        )
+    return names
+
 
 # -------------------------------------------------------------------
-# Engine
+# Library selection (per request / CLI call)
 # -------------------------------------------------------------------
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    connect_args={"check_same_thread": False},
-)
+_current_library: ContextVar[str] = ContextVar("rle_library", default=DEFAULT_LIBRARY)
+
+
+def current_library() -> str:
+    return _current_library.get()
+
+
+def library_path(name: Optional[str] = None) -> Path:
+    """
+    Database file of a library (the current one by default).
+    """
+    return library_dir(name or current_library()) / "db.sqlite"
+
+
+@contextmanager
+def use_library(name: str) -> Iterator[None]:
+    """
+    Route `engine` / `get_session()` to another library in this context.
+    """
+    library_dir(name)  # validates the name
+    token = _current_library.set(name)
+    try:
+        yield
+    finally:
+        _current_library.reset(token)
+
+
+def set_library(name: str) -> None:
+    """
+    Select the library for the rest of this context (CLI entry point).
+    """
+    library_dir(name)
+    _current_library.set(name)
+
+
+# -------------------------------------------------------------------
+# Engines
+# -------------------------------------------------------------------
+
+# Rows written through this process's engines (drives background maintenance)
+_rows_written = 0
+
+
+def _count_writes(conn, cursor, statement, parameters, context, executemany):
+    global _rows_written
+    if cursor.rowcount > 0 and statement.lstrip()[:6].upper() in ("INSERT", "UPDATE", "DELETE"):
+        _rows_written += cursor.rowcount
+
+
+def rows_written() -> int:
+    """
+    Rows inserted/updated/deleted by this process since it started.
+    """
+    return _rows_written
+
+
+# One engine (connection pool) per library, created on first use
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def library_engine(name: Optional[str] = None) -> Engine:
+    """
+    Engine of a library (the current one by default).
+    """
+    name = name or current_library()
+    eng = _engines.get(name)
+    if eng is not None:
+        return eng
+
+    with _engines_lock:
+        eng = _engines.get(name)
+        if eng is None:
+            path = library_path(name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            eng = create_engine(
+                f"sqlite:///{path}",
+                echo=False,
+                connect_args={"check_same_thread": False},
+            )
+            event.listen(eng, "after_cursor_execute", _count_writes)
+            _engines[name] = eng
+    return eng
+
+
+def open_libraries() -> List[str]:
+    """
+    Libraries with an engine in this process.
+    """
+    return list(_engines)
+
+
+class _CurrentEngine:
+    """
+    Stand-in for the engine of the library selected in this context,
+    so modules can keep using `engine.connect()`.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(library_engine(), name)
+
+
+engine = _CurrentEngine()
 
 
 # -------------------------------------------------------------------
@@ -39,16 +172,90 @@ def get_session() -> Iterator[Session]:
     """
     Provide a transactional scope around a series of operations.
     """
-    with Session(engine) as session:
+    with Session(library_engine()) as session:
         yield session
 
 
+# -------------------------------------------------------------------
+# Helpers
+# -------------------------------------------------------------------
+
+T = TypeVar("T")
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit.
+CHUNK_SIZE = 500
+
+
+def chunked(items: Sequence[T], size: int = CHUNK_SIZE) -> Iterable[List[T]]:
+    """
+    Yield consecutive slices of `items` of at most `size` elements.
+    """
+    for i in range(0, len(items), size):
+        yield list(items[i:i + size])
+
+
 # -------------------------------------------------------------------
 # Initialization
 # -------------------------------------------------------------------
 
+# Backfill statements for columns added to existing tables.
+# Keyed by (table, column); run once, right after the column is added.
+COLUMN_BACKFILLS = {
+    ("paper", "updated_at"): "UPDATE paper SET updated_at = created_at",
+}
+
+
+# Indexes not declared on the models (expression indexes, link tables)
+EXTRA_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_author_name_lower ON author(lower(name))",
+    # Reverse lookups on link tables (papers sharing an author/tag/project)
+    "CREATE INDEX IF NOT EXISTS ix_paperauthor_author_id ON paperauthor(author_id)",
+    "CREATE INDEX IF NOT EXISTS ix_papertag_tag_id ON papertag(tag_id)",
+    "CREATE INDEX IF NOT EXISTS ix_paperproject_project_id ON paperproject(project_id)",
+]
+
+
+def migrate_db() -> None:
+    """
+    Add columns and indexes introduced after a table was first created.
+
+    `create_all` only creates missing tables, so new columns on existing
+    tables are added here with ALTER TABLE. Safe to call multiple times.
+    """
+    with library_engine().connect() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {
+                row[1]
+                for row in conn.execute(text(f"PRAGMA table_info('{table.name}')"))
+            }
+            if not existing:
+                continue
+
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+
+                col_type = column.type.compile(dialect=conn.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}")
+                )
+
+                backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+                if backfill:
+                    conn.execute(text(backfill))
+
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+        for sql in EXTRA_INDEXES:
+            conn.execute(text(sql))
+
+        conn.commit()
+
+
 def init_db() -> None:
     """
-    Create database tables.
+    Create database tables and apply column migrations.
     """
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.create_all(library_engine())
+    migrate_db()
@@ -1 +1,5 @@
-from app.backend.dedup.report import find_possible_duplicates
+from app.backend.dedup.report import find_possible_duplicates, iter_possible_duplicates
+from app.backend.dedup.index import update_dedup_index
+from app.backend.dedup.exact import backfill_paper_keys, find_exact_duplicates
+from app.backend.dedup.clusters import get_dedup_clusters, list_dedup_clusters
+from app.backend.dedup.merge import merge_papers, merge_clusters
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam
+from sqlalchemy.engine import Connection
+from sqlmodel import text
+
+from app.backend.db import chunked, engine
+from app.backend.dedup.index import DEFAULT_MIN_SCORE, update_dedup_index
+
+
+# -------------------------------------------------------------------
+# Union-find
+# -------------------------------------------------------------------
+
+def _find(parent: Dict[str, str], x: str) -> str:
+    root = parent.setdefault(x, x)
+    while parent[root] != root:
+        root = parent[root]
+
+    # Path compression
+    while parent[x] != root:
+        parent[x], x = root, parent[x]
+
+    return root
+
+
+def _union(parent: Dict[str, str], size: Dict[str, int], a: str, b: str) -> None:
+    ra = _find(parent, a)
+    rb = _find(parent, b)
+    if ra == rb:
+        return
+
+    # Union by size
+    if size.get(ra, 1) < size.get(rb, 1):
+        ra, rb = rb, ra
+    parent[rb] = ra
+    size[ra] = size.get(ra, 1) + size.get(rb, 1)
+
+
+# -------------------------------------------------------------------
+# Cluster build
+# -------------------------------------------------------------------
+
+def _build_clusters(conn: Connection, threshold: float) -> int:
+    """
+    Rebuild persisted clusters from candidate pairs and exact DOI collisions.
+
+    Returns the number of clusters.
+    """
+    parent: Dict[str, str] = {}
+    size: Dict[str, int] = {}
+
+    pairs = conn.execute(
+        text("SELECT paper_1_id, paper_2_id FROM dedupcandidate WHERE score >= :threshold"),
+        {"threshold": threshold},
+    )
+    for a, b in pairs:
+        _union(parent, size, a, b)
+
+    # Exact DOI collisions are not in the candidate index
+    doi_groups = conn.execute(
+        text(
+            """
+            SELECT GROUP_CONCAT(id, ',')
+            FROM paper
+            WHERE doi_normalized IS NOT NULL
+            GROUP BY doi_normalized
+            HAVING COUNT(*) > 1;
+            """
+        )
+    )
+    for (ids,) in doi_groups:
+        first, *rest = ids.split(",")
+        for other in rest:
+            _union(parent, size, first, other)
+
+    groups: Dict[str, List[str]] = {}
+    for paper_id in parent:
+        groups.setdefault(_find(parent, paper_id), []).append(paper_id)
+
+    # Representative: prefer a record with a DOI, then the oldest one
+    rank: Dict[str, tuple] = {}
+    lookup = text(
+        "SELECT id, doi, created_at FROM paper WHERE id IN :ids"
+    ).bindparams(bindparam("ids", expanding=True))
+    for chunk in chunked(list(parent)):
+        for paper_id, doi, created_at in conn.execute(lookup, {"ids": chunk}):
+            rank[paper_id] = (doi is None, created_at or "", paper_id)
+
+    clusters = []
+    members = []
+    for cluster_id, ids in enumerate(
+        sorted(groups.values(), key=len, reverse=True), start=1
+    ):
+        ids = [i for i in ids if i in rank]
+        if len(ids) < 2:
+            continue
+        clusters.append(
+            {
+                "id": cluster_id,
+                "representative_id": min(ids, key=rank.__getitem__),
+                "size": len(ids),
+            }
+        )
+        members.extend({"cluster_id": cluster_id, "paper_id": i} for i in ids)
+
+    conn.execute(text("DELETE FROM dedupclustermember;"))
+    conn.execute(text("DELETE FROM dedupcluster;"))
+    if clusters:
+        conn.execute(
+            text(
+                "INSERT INTO dedupcluster(id, representative_id, size) "
+                "VALUES (:id, :representative_id, :size)"
+            ),
+            clusters,
+        )
+        conn.execute(
+            text(
+                "INSERT INTO dedupclustermember(cluster_id, paper_id) "
+                "VALUES (:cluster_id, :paper_id)"
+            ),
+            members,
+        )
+
+    conn.execute(
+        text(
+            """
+            UPDATE dedupstate
+            SET clusters_threshold = :threshold,
+                clusters_built_seq = candidates_seq
+            WHERE id = 1;
+            """
+        ),
+        {"threshold": threshold},
+    )
+    return len(clusters)
+
+
+def clear_dedup_clusters(conn: Connection) -> None:
+    """
+    Invalidate persisted clusters (e.g. after papers were merged).
+    """
+    conn.execute(text("DELETE FROM dedupclustermember;"))
+    conn.execute(text("DELETE FROM dedupcluster;"))
+    conn.execute(text("UPDATE dedupstate SET clusters_threshold = NULL WHERE id = 1;"))
+
+
+# -------------------------------------------------------------------
+# Cluster listing
+# -------------------------------------------------------------------
+
+def _read_clusters(
+    conn: Connection,
+    limit: Optional[int] = None,
+    cluster_ids: Optional[List[int]] = None,
+) -> List[Dict]:
+    """
+    Persisted clusters with their members (representative first).
+    """
+    where = "WHERE id IN :ids" if cluster_ids is not None else ""
+    sql = """
+        SELECT
+            c.id AS cluster_id,
+            c.representative_id,
+            c.size,
+            m.paper_id,
+            p.title
+        FROM (
+            SELECT id, representative_id, size
+            FROM dedupcluster
+            {where}
+            ORDER BY size DESC, id
+            {limit}
+        ) c
+        JOIN dedupclustermember m ON m.cluster_id = c.id
+        JOIN paper p ON p.id = m.paper_id
+        ORDER BY c.size DESC, c.id, m.paper_id = c.representative_id DESC;
+    """.format(where=where, limit="LIMIT :limit" if limit else "")
+
+    stmt = text(sql)
+    params: Dict = {}
+    if limit:
+        params["limit"] = limit
+    if cluster_ids is not None:
+        stmt = stmt.bindparams(bindparam("ids", expanding=True))
+        params["ids"] = list(cluster_ids)
+
+    clusters: Dict[int, Dict] = {}
+    for r in conn.execute(stmt, params).mappings():
+        cluster = clusters.setdefault(
+            r["cluster_id"],
+            {
+                "cluster_id": r["cluster_id"],
+                "representative_id": r["representative_id"],
+                "size": r["size"],
+                "papers": [],
+            },
+        )
+        cluster["papers"].append({"paper_id": r["paper_id"], "title": r["title"]})
+
+    return list(clusters.values())
+
+
+def list_dedup_clusters(
+    threshold: float = 0.85,
+    limit: Optional[int] = None,
+    rebuild: bool = False,
+) -> List[Dict]:
+    """
+    Return duplicate clusters, largest first.
+
+    Clusters are persisted and reused while the candidate index and
+    threshold are unchanged.
+
+    This function does NOT merge or delete papers.
+    """
+    if threshold < 0.0 or threshold > 1.0:
+        raise ValueError("Threshold must be between 0 and 1")
+
+    update_dedup_index(min(threshold, DEFAULT_MIN_SCORE))
+
+    with engine.connect() as conn:
+        state = conn.execute(
+            text(
+                """
+                SELECT
+                    clusters_threshold,
+                    clusters_built_seq IS candidates_seq AS fresh
+                FROM dedupstate
+                WHERE id = 1;
+                """
+            )
+        ).first()
+
+        if rebuild or state is None or state[0] != threshold or not state[1]:
+            _build_clusters(conn, threshold)
+            conn.commit()
+
+        return _read_clusters(conn, limit)
+
+
+def get_dedup_clusters(cluster_ids: List[int]) -> List[Dict]:
+    """
+    Persisted clusters by id, as listed (no index update or rebuild).
+    """
+    with engine.connect() as conn:
+        return _read_clusters(conn, cluster_ids=cluster_ids)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+from sqlmodel import text
+
+from app.backend.db import engine
+from app.backend.dedup.normalize import paper_keys
+
+
+# -------------------------------------------------------------------
+# Backfill of persisted dedup keys
+# -------------------------------------------------------------------
+
+def backfill_paper_keys(batch_size: int = 5000) -> int:
+    """
+    Populate title_normalized / title_fingerprint / doi_normalized
+    for papers created before these columns existed.
+
+    Returns the number of papers updated.
+    """
+    select_sql = text(
+        """
+        SELECT id, title, doi
+        FROM paper
+        WHERE title_normalized IS NULL
+        LIMIT :limit;
+        """
+    )
+    update_sql = text(
+        """
+        UPDATE paper
+        SET title_normalized = :title_normalized,
+            title_fingerprint = :title_fingerprint,
+            doi_normalized = :doi_normalized
+        WHERE id = :id;
+        """
+    )
+
+    updated = 0
+    with engine.connect() as conn:
+        while True:
+            rows = conn.execute(select_sql, {"limit": batch_size}).all()
+            if not rows:
+                break
+
+            conn.execute(
+                update_sql,
+                [
+                    {"id": paper_id, **paper_keys(title or "", doi)}
+                    for paper_id, title, doi in rows
+                ],
+            )
+            conn.commit()
+            updated += len(rows)
+
+    return updated
+
+
+# -------------------------------------------------------------------
+# Exact duplicates (indexed GROUP BY, no pairwise scoring)
+# -------------------------------------------------------------------
+
+def find_exact_duplicates() -> Dict[str, List[Dict]]:
+    """
+    Find groups of papers sharing a title fingerprint or a normalized DOI.
+
+    This function is READ-ONLY.
+    """
+    groups: Dict[str, List[Dict]] = {"fingerprint": [], "doi": []}
+
+    with engine.connect() as conn:
+        for kind, column in (("fingerprint", "title_fingerprint"), ("doi", "doi_normalized")):
+            rows = conn.execute(
+                text(
+                    f"""
+                    SELECT
+                        {column} AS key,
+                        COUNT(*) AS n,
+                        GROUP_CONCAT(id, ',') AS paper_ids
+                    FROM paper
+                    WHERE {column} IS NOT NULL
+                    GROUP BY {column}
+                    HAVING COUNT(*) > 1
+                    ORDER BY n DESC;
+                    """
+                )
+            ).mappings().all()
+
+            groups[kind] = [
+                {
+                    "key": r["key"],
+                    "count": r["n"],
+                    "paper_ids": r["paper_ids"].split(","),
+                }
+                for r in rows
+            ]
+
+    return groups
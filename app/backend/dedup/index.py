@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import Dict
+
+from sqlmodel import Session, delete, or_, select
+
+from app.backend.changes import changed_papers
+from app.backend.db import chunked, get_session
+from app.backend.models import DedupCandidate, DedupState, Paper
+from app.backend.dedup.similarity import dedup_score
+
+
+# -------------------------------------------------------------------
+# Candidate index
+# -------------------------------------------------------------------
+
+# Pairs scoring below this floor are not persisted.
+# Asking for a lower threshold triggers a rebuild at that threshold.
+DEFAULT_MIN_SCORE = 0.5
+
+# Changes that alter a paper's title or authors (merges add authors)
+DEDUP_OPS = ("create", "merge")
+
+
+def _get_state(session: Session) -> DedupState:
+    state = session.get(DedupState, 1)
+    if state is None:
+        state = DedupState(id=1, processed_seq=None, min_score=DEFAULT_MIN_SCORE)
+        session.add(state)
+    return state
+
+
+def update_dedup_index(min_score: float = DEFAULT_MIN_SCORE) -> Dict:
+    """
+    Score new or modified papers and persist candidate pairs.
+
+    Only papers created or merged into since the stored changelog seq are
+    scored (against the whole library), so the cost is proportional to
+    the delta rather than to the library size.
+
+    This function does NOT merge or delete papers.
+    """
+    if min_score < 0.0 or min_score > 1.0:
+        raise ValueError("min_score must be between 0 and 1")
+
+    with get_session() as session:
+        state = _get_state(session)
+
+        # Lower floor requested: existing index is incomplete, start over
+        if min_score < state.min_score:
+            state.processed_seq = None
+            state.min_score = min_score
+
+        changed, upto = changed_papers(session.connection(), state.processed_seq, DEDUP_OPS)
+
+        if changed is None:
+            delta = session.exec(select(Paper)).all()
+        else:
+            delta = []
+            for chunk in chunked(sorted(changed)):
+                delta.extend(session.exec(select(Paper).where(Paper.id.in_(chunk))))
+
+        if not delta:
+            if state.processed_seq != upto:
+                state.processed_seq = upto
+                session.commit()
+            return {"scored": 0, "candidates": 0}
+
+        delta_ids = {p.id for p in delta}
+
+        # Drop stale scores of the papers being rescored
+        if changed is None:
+            session.execute(delete(DedupCandidate))
+        else:
+            for chunk in chunked(sorted(delta_ids)):
+                session.execute(
+                    delete(DedupCandidate).where(
+                        or_(
+                            DedupCandidate.paper_1_id.in_(chunk),
+                            DedupCandidate.paper_2_id.in_(chunk),
+                        )
+                    )
+                )
+        session.flush()
+
+        papers = session.exec(select(Paper)).all()
+        added = 0
+
+        for p1 in delta:
+            for p2 in papers:
+                if p2.id == p1.id:
+                    continue
+
+                # Pairs inside the delta are scored once
+                if p2.id in delta_ids and p2.id < p1.id:
+                    continue
+
+                # Skip exact DOI matches (reported by find_exact_duplicates)
+                if p1.doi_normalized and p1.doi_normalized == p2.doi_normalized:
+                    continue
+
+                score = dedup_score(p1, p2)
+                if score >= state.min_score:
+                    a, b = sorted((p1.id, p2.id))
+                    session.add(DedupCandidate(paper_1_id=a, paper_2_id=b, score=score))
+                    added += 1
+
+        state.processed_seq = upto
+        state.candidates_seq = upto
+        session.commit()
+
+    return {"scored": len(delta), "candidates": added}
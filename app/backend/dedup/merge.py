@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import DateTime, bindparam
+from sqlalchemy.engine import Connection
+from sqlmodel import text
+
+from app.backend.db import engine
+from app.backend.fts import index_note, unindex_papers
+from app.backend.changes import change, record_changes
+from app.backend.facets import refresh_facets
+from app.backend.dedup.clusters import clear_dedup_clusters
+
+
+# -------------------------------------------------------------------
+# Set-based merge statements (driven by the temp table merge_map)
+# -------------------------------------------------------------------
+
+# Link tables: (table, other key column)
+_LINK_TABLES = (
+    ("papertag", "tag_id"),
+    ("paperproject", "project_id"),
+    ("paperauthor", "author_id"),
+)
+
+_DUPS = "(SELECT dup_id FROM merge_map)"
+
+
+def _create_merge_map(conn: Connection) -> None:
+    conn.execute(
+        text(
+            "CREATE TEMP TABLE IF NOT EXISTS merge_map("
+            "dup_id TEXT PRIMARY KEY, canonical_id TEXT NOT NULL)"
+        )
+    )
+    conn.execute(text("DELETE FROM merge_map;"))
+
+
+def _validate_merge_map(conn: Connection) -> None:
+    chained = conn.execute(
+        text(
+            "SELECT canonical_id FROM merge_map "
+            "WHERE canonical_id IN (SELECT dup_id FROM merge_map) LIMIT 1"
+        )
+    ).first()
+    if chained:
+        raise ValueError(f"Paper {chained[0]} is both canonical and a duplicate")
+
+    missing = conn.execute(
+        text(
+            """
+            SELECT id FROM (
+                SELECT dup_id AS id FROM merge_map
+                UNION
+                SELECT canonical_id FROM merge_map
+            )
+            WHERE id NOT IN (SELECT id FROM paper)
+            LIMIT 1;
+            """
+        )
+    ).first()
+    if missing:
+        raise ValueError(f"Paper not found: {missing[0]}")
+
+
+def _merge_notes(conn: Connection) -> None:
+    """
+    Fold the duplicates' notes into one note per canonical paper.
+
+    Markdown is concatenated (canonical note first, then oldest first);
+    the kept note is re-indexed and the others leave note and note_fts.
+    """
+    rows = conn.execute(
+        text(
+            f"""
+            SELECT
+                n.id,
+                n.content_md,
+                COALESCE(m.canonical_id, n.paper_id) AS owner,
+                m.dup_id IS NOT NULL AS from_dup
+            FROM note n
+            LEFT JOIN merge_map m ON m.dup_id = n.paper_id
+            WHERE n.paper_id IN {_DUPS}
+               OR n.paper_id IN (SELECT canonical_id FROM merge_map)
+            ORDER BY owner, from_dup, n.updated_at, n.id;
+            """
+        )
+    ).all()
+
+    notes: Dict[str, List[Tuple[int, str, bool]]] = {}
+    for note_id, content_md, owner, from_dup in rows:
+        notes.setdefault(owner, []).append((note_id, content_md or "", bool(from_dup)))
+
+    now = datetime.utcnow()
+    changes = []
+    for owner, group in notes.items():
+        if not any(from_dup for _, _, from_dup in group):
+            continue
+
+        keep_id = group[0][0]
+        parts: List[str] = []
+        for _, content_md, _ in group:
+            part = content_md.strip()
+            if part and part not in parts:
+                parts.append(part)
+        merged = "\n\n".join(parts)
+
+        conn.execute(
+            text(
+                "UPDATE note SET paper_id = :owner, content_md = :content_md, "
+                "updated_at = :now WHERE id = :id"
+            ).bindparams(bindparam("now", type_=DateTime())),
+            {"owner": owner, "content_md": merged, "now": now, "id": keep_id},
+        )
+        dropped = [{"id": note_id} for note_id, _, _ in group[1:]]
+        if dropped:
+            conn.execute(text("DELETE FROM note WHERE id = :id"), dropped)
+            conn.execute(text("DELETE FROM note_fts WHERE rowid = :id"), dropped)
+        index_note(conn, keep_id, merged)
+        changes.append(change("paper", owner, "note", content_md=merged))
+
+    record_changes(conn, changes)
+
+
+def _apply_merge_map(conn: Connection) -> int:
+    """
+    Re-point everything from duplicates to canonical papers and delete them.
+    """
+    dup_ids = [r[0] for r in conn.execute(text("SELECT dup_id FROM merge_map"))]
+    if not dup_ids:
+        return 0
+
+    for table, key in _LINK_TABLES:
+        conn.execute(
+            text(
+                f"""
+                INSERT OR IGNORE INTO {table}(paper_id, {key})
+                SELECT m.canonical_id, l.{key}
+                FROM {table} l
+                JOIN merge_map m ON m.dup_id = l.paper_id;
+                """
+            )
+        )
+        conn.execute(text(f"DELETE FROM {table} WHERE paper_id IN {_DUPS};"))
+
+    _merge_notes(conn)
+
+    # Derived state of the duplicates
+    conn.execute(
+        text(
+            f"DELETE FROM dedupcandidate "
+            f"WHERE paper_1_id IN {_DUPS} OR paper_2_id IN {_DUPS};"
+        )
+    )
+    conn.execute(text(f"DELETE FROM exportfragment WHERE paper_id IN {_DUPS};"))
+    conn.execute(
+        text(
+            f"DELETE FROM paperneighbor "
+            f"WHERE paper_id IN {_DUPS} OR neighbor_id IN {_DUPS};"
+        )
+    )
+    clear_dedup_clusters(conn)
+
+    # Change feed: duplicates disappear into their canonical paper
+    conn.execute(
+        text(
+            """
+            INSERT INTO changelog(at, entity, entity_id, op, data)
+            SELECT :now, 'paper', dup_id, 'merge', json_object('into', canonical_id)
+            FROM merge_map;
+            """
+        ).bindparams(bindparam("now", type_=DateTime())),
+        {"now": datetime.utcnow()},
+    )
+
+    # Incremental FTS update, then drop the rows
+    unindex_papers(conn, dup_ids)
+    conn.execute(text(f"DELETE FROM paper WHERE id IN {_DUPS};"))
+
+    # Canonical papers gained authors/links: refresh exports and dedup scores
+    conn.execute(
+        text(
+            "UPDATE paper SET updated_at = :now "
+            "WHERE id IN (SELECT canonical_id FROM merge_map);"
+        ).bindparams(bindparam("now", type_=DateTime())),
+        {"now": datetime.utcnow()},
+    )
+
+    # Tag/year/venue counts lost whole papers
+    refresh_facets(conn)
+
+    conn.execute(text("DROP TABLE merge_map;"))
+    return len(dup_ids)
+
+
+def _run_merge(fill: Callable[[Connection], None]) -> Dict:
+    start = time.perf_counter()
+
+    with engine.connect() as conn:
+        _create_merge_map(conn)
+        fill(conn)
+        _validate_merge_map(conn)
+        merged = _apply_merge_map(conn)
+        conn.commit()
+
+    return {"merged": merged, "seconds": round(time.perf_counter() - start, 3)}
+
+
+# -------------------------------------------------------------------
+# Public API
+# -------------------------------------------------------------------
+
+def merge_papers(pairs: Iterable[Tuple[str, str]]) -> Dict:
+    """
+    Merge duplicates into canonical papers in one transaction.
+
+    `pairs` are (canonical_id, duplicate_id). Tags, project links
+    and authors move to the canonical paper, notes are concatenated
+    into its note; duplicates are deleted.
+
+    This is DESTRUCTIVE and only runs when explicitly requested.
+    """
+    mapping: Dict[str, str] = {}
+    for canonical_id, dup_id in pairs:
+        if canonical_id == dup_id:
+            continue
+        if mapping.setdefault(dup_id, canonical_id) != canonical_id:
+            raise ValueError(f"Paper {dup_id} mapped to several canonical papers")
+
+    def fill(conn: Connection) -> None:
+        if mapping:
+            conn.execute(
+                text("INSERT INTO merge_map(dup_id, canonical_id) VALUES (:dup, :canonical)"),
+                [{"dup": d, "canonical": c} for d, c in mapping.items()],
+            )
+
+    return _run_merge(fill)
+
+
+def _cluster_members(spec: Dict) -> Tuple[int, str, FrozenSet[str]]:
+    """
+    (cluster_id, representative_id, member ids) of a cluster as listed by
+    list_dedup_clusters (members under "papers"), or with bare "paper_ids".
+    """
+    try:
+        if "papers" in spec:
+            members = [p["paper_id"] for p in spec["papers"]]
+        else:
+            members = spec["paper_ids"]
+        return (
+            int(spec["cluster_id"]),
+            str(spec["representative_id"]),
+            frozenset(str(pid) for pid in members),
+        )
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(
+            "Clusters need cluster_id, representative_id and papers (or paper_ids)"
+        ) from None
+
+
+def merge_clusters(clusters: Optional[List[Dict]] = None) -> Dict:
+    """
+    Merge persisted dedup clusters into their representatives.
+
+    Each cluster is given as listed by list_dedup_clusters: {"cluster_id",
+    "representative_id", "papers": [{"paper_id", ...}]}; a plain
+    "paper_ids" list may replace "papers". Cluster ids are renumbered on every rebuild, so a
+    cluster whose representative or members no longer match is rejected
+    and nothing is merged. `clusters=None` merges every persisted cluster.
+
+    This is DESTRUCTIVE and only runs when explicitly requested.
+    """
+    specs = [_cluster_members(c) for c in clusters] if clusters is not None else None
+
+    def fill(conn: Connection) -> None:
+        sql = """
+            INSERT INTO merge_map(dup_id, canonical_id)
+            SELECT m.paper_id, c.representative_id
+            FROM dedupclustermember m
+            JOIN dedupcluster c ON c.id = m.cluster_id
+            WHERE m.paper_id != c.representative_id
+        """
+        if specs is None:
+            conn.execute(text(sql))
+            return
+
+        persisted: Dict[int, Tuple[str, set]] = {}
+        rows = conn.execute(
+            text(
+                """
+                SELECT c.id, c.representative_id, m.paper_id
+                FROM dedupcluster c
+                JOIN dedupclustermember m ON m.cluster_id = c.id
+                WHERE c.id IN :ids;
+                """
+            ).bindparams(bindparam("ids", expanding=True)),
+            {"ids": [cluster_id for cluster_id, _, _ in specs]},
+        )
+        for cluster_id, representative_id, paper_id in rows:
+            persisted.setdefault(cluster_id, (representative_id, set()))[1].add(paper_id)
+
+        for cluster_id, representative_id, members in specs:
+            if persisted.get(cluster_id) != (representative_id, members):
+                raise ValueError(
+                    f"Cluster {cluster_id} changed since it was listed; list clusters again"
+                )
+
+        conn.execute(
+            text(sql + " AND c.id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": [cluster_id for cluster_id, _, _ in specs]},
+        )
+
+    return _run_merge(fill)
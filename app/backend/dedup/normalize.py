@@ -1,6 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import re
+from typing import Dict, Optional
+
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_SPACE_RE = re.compile(r"\s+")
+_DOI_PREFIX_RE = re.compile(
+    r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)",
+    re.IGNORECASE,
+)
 
 
 def normalize_title(title: str) -> str:
@@ -15,6 +25,48 @@ def normalize_title(title: str) -> str:
         return ""
 
     t = title.lower()
-    t = re.sub(r"[^\w\s]", " ", t)     # replace punctuation with spaces
-    t = re.sub(r"\s+", " ", t).strip() # collapse whitespace
+    t = _PUNCT_RE.sub(" ", t)           # replace punctuation with spaces
+    t = _SPACE_RE.sub(" ", t).strip()   # collapse whitespace
     return t
+
+
+def title_fingerprint(title: str) -> Optional[str]:
+    """
+    Order-insensitive title fingerprint (hash of sorted unique tokens).
+
+    Titles differing only in case, punctuation or word order
+    share a fingerprint.
+    """
+    tokens = sorted(set(normalize_title(title).split()))
+    if not tokens:
+        return None
+
+    digest = hashlib.blake2b(" ".join(tokens).encode("utf-8"), digest_size=8)
+    return digest.hexdigest()
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """
+    Normalize a DOI for equality checks.
+
+    - strips resolver URL / "doi:" prefixes
+    - strips trailing punctuation
+    - lowercases (DOIs are case-insensitive)
+    """
+    if not doi:
+        return None
+
+    d = _DOI_PREFIX_RE.sub("", doi.strip())
+    d = d.rstrip(".,;").lower()
+    return d or None
+
+
+def paper_keys(title: str, doi: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Persisted dedup keys for a paper, as Paper field values.
+    """
+    return {
+        "title_normalized": normalize_title(title),
+        "title_fingerprint": title_fingerprint(title),
+        "doi_normalized": normalize_doi(doi),
+    }
@@ -1,48 +1,87 @@
 from __future__ import annotations
 
-from typing import List, Dict
-from sqlmodel import select
+from typing import Dict, Iterator, List, Optional
+from sqlmodel import text
 
-from app.backend.db import get_session
-from app.backend.models import Paper
-from app.backend.dedup.similarity import dedup_score
+from app.backend.db import engine
+from app.backend.dedup.index import DEFAULT_MIN_SCORE, update_dedup_index
 
 
-def find_possible_duplicates(threshold: float = 0.85) -> List[Dict]:
+def iter_possible_duplicates(
+    threshold: float = 0.85,
+    top_k: Optional[int] = None,
+    max_results: Optional[int] = None,
+) -> Iterator[Dict]:
     """
-    Find possible duplicate papers based on similarity score.
+    Stream possible duplicate pairs, best score first.
+
+    New or modified papers are scored into the persisted candidate
+    index first; pairs are then streamed from that index row by row.
 
-    This function is READ-ONLY.
-    It does NOT merge or delete anything.
+    - top_k: keep at most k pairs per paper
+    - max_results: stop after this many pairs
+
+    This function does NOT merge or delete papers.
     """
     if threshold < 0.0 or threshold > 1.0:
         raise ValueError("Threshold must be between 0 and 1")
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    if max_results is not None and max_results < 1:
+        raise ValueError("max_results must be at least 1")
 
-    results: List[Dict] = []
+    update_dedup_index(min(threshold, DEFAULT_MIN_SCORE))
 
-    with get_session() as session:
-        papers = session.exec(select(Paper)).all()
+    sql = """
+        SELECT
+            c.paper_1_id,
+            p1.title AS paper_1_title,
+            c.paper_2_id,
+            p2.title AS paper_2_title,
+            c.score
+        FROM dedupcandidate c
+        JOIN paper p1 ON p1.id = c.paper_1_id
+        JOIN paper p2 ON p2.id = c.paper_2_id
+        WHERE c.score >= :threshold
+        ORDER BY c.score DESC
+    """
+    params: Dict = {"threshold": threshold}
 
-        count = len(papers)
-        for i in range(count):
-            for j in range(i + 1, count):
-                p1 = papers[i]
-                p2 = papers[j]
+    # Without per-paper limits the cap can be pushed into SQL
+    if max_results is not None and top_k is None:
+        sql += " LIMIT :limit"
+        params["limit"] = max_results
 
-                # Skip exact DOI matches (already-known duplicates)
-                if p1.doi and p2.doi and p1.doi == p2.doi:
+    per_paper: Dict[str, int] = {}
+    emitted = 0
+
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True).execute(text(sql), params)
+
+        for row in result.mappings():
+            if top_k is not None:
+                a = per_paper.get(row["paper_1_id"], 0)
+                b = per_paper.get(row["paper_2_id"], 0)
+                if a >= top_k or b >= top_k:
                     continue
+                per_paper[row["paper_1_id"]] = a + 1
+                per_paper[row["paper_2_id"]] = b + 1
+
+            yield dict(row)
 
-                score = dedup_score(p1, p2)
-                if score >= threshold:
-                    results.append(
-                        {
-                            "paper_1_id": p1.id,
-                            "paper_1_title": p1.title,
-                            "paper_2_id": p2.id,
-                            "paper_2_title": p2.title,
-                            "score": score,
-                        }
-                    )
-
-    return results
+            emitted += 1
+            if max_results is not None and emitted >= max_results:
+                break
+
+
+def find_possible_duplicates(
+    threshold: float = 0.85,
+    top_k: Optional[int] = None,
+    max_results: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Find possible duplicate papers based on similarity score.
+
+    List form of `iter_possible_duplicates`.
+    """
+    return list(iter_possible_duplicates(threshold, top_k, max_results))
@@ -24,6 +24,13 @@ def title_similarity(title_a: str, title_b: str) -> float:
     return SequenceMatcher(None, a, b).ratio()
 
 
+def _normalized_title(paper: Paper) -> str:
+    """
+    Persisted normalized title, computed on the fly if not backfilled yet.
+    """
+    return paper.title_normalized or normalize_title(paper.title)
+
+
 # -------------------------------------------------------------------
 # Author overlap
 # -------------------------------------------------------------------
@@ -53,7 +60,9 @@ def dedup_score(p1: Paper, p2: Paper) -> float:
     Title similarity: 70%
     Author overlap:   30%
     """
-    t_score = title_similarity(p1.title, p2.title)
+    a = _normalized_title(p1)
+    b = _normalized_title(p2)
+    t_score = SequenceMatcher(None, a, b).ratio() if a and b else 0.0
     a_score = author_overlap(p1, p2)
 
     return round((0.7 * t_score + 0.3 * a_score), 3)
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
-from typing import List
-from sqlmodel import select
-
-from app.backend.db import get_session
+from typing import Optional
 from app.backend.models import Paper
+from app.backend.export.cache import cached_fragments
 
 
 def _bibtex_key(paper: Paper) -> str:
@@ -15,39 +13,51 @@ def _bibtex_key(paper: Paper) -> str:
     return base.replace(":", "_").replace("/", "_")
 
 
-def export_bibtex() -> str:
+def render_bibtex(p: Paper) -> str:
     """
-    Export all papers as BibTeX entries.
+    Render one paper as a BibTeX entry.
     """
-    entries: List[str] = []
-
-    with get_session() as session:
-        papers = session.exec(select(Paper)).all()
-
-        for p in papers:
-            key = _bibtex_key(p)
-
-            authors = " and ".join(a.name for a in p.authors) if p.authors else "Unknown"
-
-            fields = {
-                "title": p.title,
-                "author": authors,
-                "year": str(p.year) if p.year else None,
-                "journal": p.venue,
-                "doi": p.doi,
-            }
-
-            body = []
-            for k, v in fields.items():
-                if v:
-                    body.append(f"  {k} = {{{v}}}")
-
-            entry = "@article{{{key},\n{body}\n}}".format(
-                key=key,
-                body=",\n".join(body),
-            )
-
-            entries.append(entry)
+    key = _bibtex_key(p)
+
+    authors = " and ".join(a.name for a in p.authors) if p.authors else "Unknown"
+
+    fields = {
+        "title": p.title,
+        "author": authors,
+        "year": str(p.year) if p.year else None,
+        "journal": p.venue,
+        "doi": p.doi,
+    }
+
+    body = []
+    for k, v in fields.items():
+        if v:
+            body.append(f"  {k} = {{{v}}}")
+
+    return "@article{{{key},\n{body}\n}}".format(
+        key=key,
+        body=",\n".join(body),
+    )
+
+
+def export_bibtex(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+) -> str:
+    """
+    Export papers (optionally filtered) as BibTeX entries.
+    """
+    entries = cached_fragments(
+        "bibtex",
+        render_bibtex,
+        project_id=project_id,
+        tag=tag,
+        year_from=year_from,
+        year_to=year_to,
+        query=query,
+    )
 
     return "\n\n".join(entries)
-
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+
+from sqlmodel import select, text
+
+from app.backend.db import chunked, engine, get_session
+from app.backend.models import Paper
+from app.backend.search import paper_filter_sql
+
+
+# -------------------------------------------------------------------
+# Incremental export store
+# -------------------------------------------------------------------
+
+def cached_fragments(
+    fmt: str,
+    render: Callable[[Paper], str],
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+) -> List[str]:
+    """
+    Return one rendered fragment per paper, in library order.
+
+    Fragments are cached in `exportfragment` keyed by (paper_id, format)
+    and the paper's `updated_at`; only missing or stale fragments are
+    re-rendered. Filters are applied in SQL, so only matching rows are read.
+    """
+    joins, where, params = paper_filter_sql(
+        project_id=project_id,
+        tag=tag,
+        year_from=year_from,
+        year_to=year_to,
+        query=query,
+    )
+    lookup_sql = text(
+        f"""
+        SELECT
+            p.id AS paper_id,
+            p.updated_at AS updated_at,
+            f.body AS body
+        FROM paper p
+        LEFT JOIN exportfragment f
+            ON f.paper_id = p.id
+           AND f.format = :fmt
+           AND f.paper_updated_at = p.updated_at
+        {joins}
+        {where}
+        ORDER BY p.rowid;
+        """
+    )
+    upsert_sql = text(
+        """
+        INSERT OR REPLACE INTO exportfragment(paper_id, format, paper_updated_at, body)
+        VALUES (:paper_id, :format, :paper_updated_at, :body);
+        """
+    )
+
+    with engine.connect() as conn:
+        rows = conn.execute(lookup_sql, {"fmt": fmt, **params}).all()
+
+    # updated_at is carried as the raw stored string so the cache key
+    # compares exactly against the paper row
+    stale = {paper_id: updated_at for paper_id, updated_at, body in rows if body is None}
+    rendered: Dict[str, str] = {}
+
+    if stale:
+        with get_session() as session:
+            for chunk in chunked(list(stale)):
+                papers = session.exec(select(Paper).where(Paper.id.in_(chunk))).all()
+                params = []
+                for p in papers:
+                    rendered[p.id] = render(p)
+                    params.append(
+                        {
+                            "paper_id": p.id,
+                            "format": fmt,
+                            "paper_updated_at": stale[p.id],
+                            "body": rendered[p.id],
+                        }
+                    )
+                if params:
+                    session.execute(upsert_sql, params)
+            session.commit()
+
+    return [
+        body if body is not None else rendered[paper_id]
+        for paper_id, _, body in rows
+        if body is not None or paper_id in rendered
+    ]
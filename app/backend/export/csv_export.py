@@ -1,16 +1,43 @@
 from __future__ import annotations
 
+from typing import Optional
 import csv
 import io
-from sqlmodel import select
 
-from app.backend.db import get_session
 from app.backend.models import Paper
+from app.backend.export.cache import cached_fragments
 
 
-def export_csv() -> str:
+def render_csv_row(p: Paper) -> str:
     """
-    Export all papers as CSV text.
+    Render one paper as a CSV row (with line terminator).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    authors = "; ".join(a.name for a in p.authors) if p.authors else ""
+
+    writer.writerow([
+        p.id,
+        p.title,
+        authors,
+        p.year or "",
+        p.venue or "",
+        p.doi or "",
+    ])
+
+    return buffer.getvalue()
+
+
+def export_csv(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+) -> str:
+    """
+    Export papers (optionally filtered) as CSV text.
     """
     buffer = io.StringIO()
     writer = csv.writer(buffer)
@@ -25,19 +52,14 @@ def export_csv() -> str:
         "doi",
     ])
 
-    with get_session() as session:
-        papers = session.exec(select(Paper)).all()
+    rows = cached_fragments(
+        "csv",
+        render_csv_row,
+        project_id=project_id,
+        tag=tag,
+        year_from=year_from,
+        year_to=year_to,
+        query=query,
+    )
 
-        for p in papers:
-            authors = "; ".join(a.name for a in p.authors) if p.authors else ""
-
-            writer.writerow([
-                p.id,
-                p.title,
-                authors,
-                p.year or "",
-                p.venue or "",
-                p.doi or "",
-            ])
-
-    return buffer.getvalue()
+    return buffer.getvalue() + "".join(rows)
@@ -1,38 +1,56 @@
 from __future__ import annotations
 
-from typing import List
-from sqlmodel import select
+from typing import List, Optional
 
-from app.backend.db import get_session
 from app.backend.models import Paper
+from app.backend.export.cache import cached_fragments
 
 
-def export_ieee() -> str:
+def render_ieee(p: Paper) -> str:
     """
-    Export all papers as IEEE-style reference strings.
+    Render one paper as an IEEE-style reference (without the [n] label).
     """
-    lines: List[str] = []
-
-    with get_session() as session:
-        papers = session.exec(select(Paper)).all()
-
-        for idx, p in enumerate(papers, start=1):
-            authors = ", ".join(a.name for a in p.authors) if p.authors else "Unknown"
-
-            parts = [
-                f"[{idx}] {authors}",
-                f"\"{p.title},\"",
-            ]
+    authors = ", ".join(a.name for a in p.authors) if p.authors else "Unknown"
+
+    parts = [
+        authors,
+        f"\"{p.title},\"",
+    ]
+
+    if p.venue:
+        parts.append(p.venue)
+    if p.year:
+        parts.append(str(p.year))
+    if p.doi:
+        parts.append(f"doi:{p.doi}")
+
+    return " ".join(parts) + "."
+
+
+def export_ieee(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+) -> str:
+    """
+    Export papers (optionally filtered) as IEEE-style reference strings.
+    """
+    refs = cached_fragments(
+        "ieee",
+        render_ieee,
+        project_id=project_id,
+        tag=tag,
+        year_from=year_from,
+        year_to=year_to,
+        query=query,
+    )
 
-            if p.venue:
-                parts.append(p.venue)
-            if p.year:
-                parts.append(str(p.year))
-            if p.doi:
-                parts.append(f"doi:{p.doi}")
+    lines: List[str] = []
 
-            line = " ".join(parts) + "."
-            lines.append(line)
+    # Labels depend on position, so they are added at assembly time
+    for idx, ref in enumerate(refs, start=1):
+        lines.append(f"[{idx}] {ref}")
 
     return "\n".join(lines)
-
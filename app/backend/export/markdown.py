@@ -1,38 +1,54 @@
 from __future__ import annotations
 
-from typing import List
-from sqlmodel import select
+from typing import List, Optional
 
-from app.backend.db import get_session
 from app.backend.models import Paper
+from app.backend.export.cache import cached_fragments
 
 
-def export_markdown() -> str:
+def render_markdown(p: Paper) -> str:
     """
-    Export all papers as a Markdown document.
+    Render one paper as a Markdown list item.
     """
+    title = p.title or "(untitled)"
+    line = f"- **{title}**"
+
+    meta_parts: List[str] = []
+    if p.year:
+        meta_parts.append(str(p.year))
+    if p.venue:
+        meta_parts.append(p.venue)
+    if p.doi:
+        meta_parts.append(f"DOI: `{p.doi}`")
+
+    if meta_parts:
+        line += " — " + " • ".join(meta_parts)
+
+    return line
+
+
+def export_markdown(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+) -> str:
+    """
+    Export papers (optionally filtered) as a Markdown document.
+    """
+    items = cached_fragments(
+        "markdown",
+        render_markdown,
+        project_id=project_id,
+        tag=tag,
+        year_from=year_from,
+        year_to=year_to,
+        query=query,
+    )
+
     lines: List[str] = []
     lines.append("# Research Library\n")
-
-    with get_session() as session:
-        papers = session.exec(select(Paper)).all()
-
-        for p in papers:
-            title = p.title or "(untitled)"
-            line = f"- **{title}**"
-
-            meta_parts: List[str] = []
-            if p.year:
-                meta_parts.append(str(p.year))
-            if p.venue:
-                meta_parts.append(p.venue)
-            if p.doi:
-                meta_parts.append(f"DOI: `{p.doi}`")
-
-            if meta_parts:
-                line += " — " + " • ".join(meta_parts)
-
-            lines.append(line)
+    lines.extend(items)
 
     return "\n".join(lines) + "\n"
-
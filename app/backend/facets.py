@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Connection
+from sqlmodel import text
+
+from app.backend.db import engine
+
+
+# -------------------------------------------------------------------
+# Facet queries
+# -------------------------------------------------------------------
+
+# facet -> GROUP BY query over `paper p` (filter joins are inserted at {joins})
+FACET_SQL = {
+    "tag": """
+        SELECT t.name AS value, COUNT(*) AS count
+        FROM paper p
+        JOIN papertag pt ON pt.paper_id = p.id
+        JOIN tag t ON t.id = pt.tag_id
+        {joins}
+        GROUP BY t.name
+    """,
+    "year": """
+        SELECT CAST(p.year AS TEXT) AS value, COUNT(*) AS count
+        FROM paper p
+        {joins}
+        WHERE p.year IS NOT NULL
+        GROUP BY p.year
+    """,
+    "venue": """
+        SELECT p.venue AS value, COUNT(*) AS count
+        FROM paper p
+        {joins}
+        WHERE p.venue IS NOT NULL AND p.venue != ''
+        GROUP BY p.venue
+    """,
+}
+
+# Marker row: present once the summary table has been fully built
+_BUILT = ("_built", "")
+
+_FTS_JOIN = (
+    "JOIN (SELECT rowid FROM paper_fts WHERE paper_fts MATCH :q) f "
+    "ON f.rowid = p.rowid"
+)
+
+
+# -------------------------------------------------------------------
+# Summary table maintenance
+# -------------------------------------------------------------------
+
+def refresh_facets(conn: Connection) -> None:
+    """
+    Recompute the facetcount summary table from scratch.
+
+    Runs on the caller's connection (caller commits).
+    """
+    conn.execute(text("DELETE FROM facetcount;"))
+    for facet, sql in FACET_SQL.items():
+        conn.execute(
+            text(
+                f"INSERT INTO facetcount(facet, value, count) "
+                f"SELECT '{facet}', value, count FROM ({sql.format(joins='')})"
+            )
+        )
+    conn.execute(
+        text("INSERT INTO facetcount(facet, value, count) VALUES (:facet, :value, 0)"),
+        {"facet": _BUILT[0], "value": _BUILT[1]},
+    )
+
+
+def _facets_built(conn: Connection) -> bool:
+    row = conn.execute(
+        text("SELECT 1 FROM facetcount WHERE facet = :facet AND value = :value"),
+        {"facet": _BUILT[0], "value": _BUILT[1]},
+    ).first()
+    return row is not None
+
+
+def bump_facets(conn: Connection, counts: Dict[Tuple[str, object], int]) -> None:
+    """
+    Add deltas to facet counts: {(facet, value): delta}.
+
+    Runs on the caller's connection so it commits with the write.
+    Skipped until the table is built (the first build counts everything).
+    """
+    if not _facets_built(conn):
+        return
+
+    params = [
+        {"facet": facet, "value": str(value), "delta": delta}
+        for (facet, value), delta in counts.items()
+        if value not in (None, "") and delta
+    ]
+    if not params:
+        return
+
+    conn.execute(
+        text(
+            """
+            INSERT INTO facetcount(facet, value, count)
+            VALUES (:facet, :value, :delta)
+            ON CONFLICT(facet, value) DO UPDATE SET count = count + excluded.count;
+            """
+        ),
+        params,
+    )
+
+
+def paper_facet_counts(rows: List[Dict]) -> Counter:
+    """
+    Year / venue facet deltas for newly inserted paper rows.
+    """
+    counts: Counter = Counter()
+    for r in rows:
+        counts[("year", r.get("year"))] += 1
+        counts[("venue", r.get("venue"))] += 1
+    return counts
+
+
+# -------------------------------------------------------------------
+# Facet listing
+# -------------------------------------------------------------------
+
+def get_facets(query: Optional[str] = None, limit: int = 50) -> Dict[str, List[Dict]]:
+    """
+    Tag counts, year histogram and venue counts.
+
+    Unfiltered facets are read from the facetcount summary table;
+    with an FTS query they are computed over the matching papers only.
+    """
+    facets: Dict[str, List[Dict]] = {}
+
+    with engine.connect() as conn:
+        if query:
+            for facet, sql in FACET_SQL.items():
+                rows = conn.execute(
+                    text(f"{sql.format(joins=_FTS_JOIN)} ORDER BY count DESC LIMIT :limit"),
+                    {"q": query, "limit": limit},
+                ).mappings().all()
+                facets[facet] = [dict(r) for r in rows]
+        else:
+            if not _facets_built(conn):
+                refresh_facets(conn)
+                conn.commit()
+
+            for facet in FACET_SQL:
+                rows = conn.execute(
+                    text(
+                        """
+                        SELECT value, count
+                        FROM facetcount
+                        WHERE facet = :facet AND count > 0
+                        ORDER BY count DESC
+                        LIMIT :limit;
+                        """
+                    ),
+                    {"facet": facet, "limit": limit},
+                ).mappings().all()
+                facets[facet] = [dict(r) for r in rows]
+
+    # Histogram reads naturally in year order
+    facets["year"].sort(key=lambda r: r["value"])
+
+    return {
+        "tags": facets["tag"],
+        "years": facets["year"],
+        "venues": facets["venue"],
+    }
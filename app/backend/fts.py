@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from typing import Sequence
+
+from sqlalchemy import bindparam
+from sqlalchemy.engine import Connection
 from sqlmodel import text
 
-from app.backend.db import engine
+from app.backend.db import chunked, engine
 
 
 # -------------------------------------------------------------------
@@ -17,22 +21,66 @@ USING fts5(
   abstract,
   doi,
   content='',
+  tokenize='unicode61',
+  prefix='2 3 4'
+);
+"""
+
+# Notes keep their own copy of the text so single rows can be replaced
+# on every note write (rowid = note.id).
+NOTE_FTS_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS note_fts
+USING fts5(
+  content_md,
   tokenize='unicode61'
 );
 """
 
 
+PAPER_FTS_FILL_SQL = """
+INSERT INTO paper_fts(rowid, paper_id, title, abstract, doi)
+SELECT
+    rowid,
+    id,
+    title,
+    COALESCE(abstract, ''),
+    COALESCE(doi, '')
+FROM paper;
+"""
+
+
 # -------------------------------------------------------------------
 # FTS helpers
 # -------------------------------------------------------------------
 
 def ensure_fts() -> None:
     """
-    Ensure the FTS virtual table exists.
+    Ensure the FTS virtual tables exist.
     Safe to call multiple times.
     """
     with engine.connect() as conn:
+        paper_fts_sql = conn.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = 'paper_fts'")
+        ).scalar()
+        if paper_fts_sql and "prefix=" not in paper_fts_sql:
+            # Created before prefix indexes: recreate, then refill below
+            conn.execute(text("DROP TABLE paper_fts;"))
+            paper_fts_sql = None
+
         conn.execute(text(FTS_SCHEMA_SQL))
+        if not paper_fts_sql:
+            conn.execute(text(PAPER_FTS_FILL_SQL))
+
+        has_note_fts = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'note_fts'")
+        ).first()
+        conn.execute(text(NOTE_FTS_SCHEMA_SQL))
+        if not has_note_fts:
+            # One-time fill for notes written before note_fts existed
+            conn.execute(
+                text("INSERT INTO note_fts(rowid, content_md) SELECT id, content_md FROM note;")
+            )
+
         conn.commit()
 
 
@@ -43,20 +91,72 @@ def rebuild_fts() -> None:
     MVP strategy:
     - clear index
     - reinsert all papers
+
+    paper_fts is contentless: rows are keyed by paper.rowid
+    (column values are not stored and read back as NULL).
     """
     with engine.connect() as conn:
-        conn.execute(text("DELETE FROM paper_fts;"))
-        conn.execute(
-            text(
-                """
-                INSERT INTO paper_fts(paper_id, title, abstract, doi)
-                SELECT
-                    id,
-                    title,
-                    COALESCE(abstract, ''),
-                    COALESCE(doi, '')
-                FROM paper;
-                """
-            )
-        )
+        conn.execute(text("INSERT INTO paper_fts(paper_fts) VALUES('delete-all');"))
+        conn.execute(text(PAPER_FTS_FILL_SQL))
         conn.commit()
+
+
+def index_papers(conn: Connection, paper_ids: Sequence[str]) -> None:
+    """
+    Add newly created papers to the FTS index (no full rebuild).
+
+    Runs on the caller's connection so it commits with the paper rows.
+    """
+    sql = text(
+        """
+        INSERT INTO paper_fts(rowid, paper_id, title, abstract, doi)
+        SELECT
+            rowid,
+            id,
+            title,
+            COALESCE(abstract, ''),
+            COALESCE(doi, '')
+        FROM paper
+        WHERE id IN :ids;
+        """
+    ).bindparams(bindparam("ids", expanding=True))
+
+    for chunk in chunked(list(paper_ids)):
+        conn.execute(sql, {"ids": chunk})
+
+
+def unindex_papers(conn: Connection, paper_ids: Sequence[str]) -> None:
+    """
+    Remove papers from the FTS index (no full rebuild).
+
+    Contentless FTS5 rows are deleted by replaying the indexed values,
+    so this must run before the paper rows are changed or deleted.
+    """
+    sql = text(
+        """
+        INSERT INTO paper_fts(paper_fts, rowid, paper_id, title, abstract, doi)
+        SELECT
+            'delete',
+            rowid,
+            id,
+            title,
+            COALESCE(abstract, ''),
+            COALESCE(doi, '')
+        FROM paper
+        WHERE id IN :ids;
+        """
+    ).bindparams(bindparam("ids", expanding=True))
+
+    for chunk in chunked(list(paper_ids)):
+        conn.execute(sql, {"ids": chunk})
+
+
+def index_note(conn: Connection, note_id: int, content_md: str) -> None:
+    """
+    Replace one note in the notes FTS index (no full rebuild).
+    """
+    conn.execute(text("DELETE FROM note_fts WHERE rowid = :id;"), {"id": note_id})
+    conn.execute(
+        text("INSERT INTO note_fts(rowid, content_md) VALUES (:id, :content_md);"),
+        {"id": note_id, "content_md": content_md},
+    )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+# Files at least this large are hashed through mmap
+MMAP_MIN_SIZE = 1024 * 1024
+
+# Block read from each end of a file for the pre-hash
+PREHASH_BLOCK = 64 * 1024
+
+
+# -------------------------------------------------------------------
+# Single-file hashing
+# -------------------------------------------------------------------
+
+def sha256_file(path: Path) -> str:
+    """
+    Full SHA-256 of a file.
+
+    Large files are hashed from a memory map in one call and small ones
+    with `hashlib.file_digest`; both release the GIL while hashing.
+    """
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def prehash_file(path: Path, block: int = PREHASH_BLOCK) -> str:
+    """
+    Cheap identity hint: size + first and last blocks.
+
+    Different pre-hashes mean different files; equal pre-hashes
+    still need a full SHA-256 to confirm.
+    """
+    h = hashlib.blake2b(digest_size=16)
+
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        h.update(size.to_bytes(8, "little"))
+        h.update(f.read(block))
+        if size > 2 * block:
+            f.seek(-block, os.SEEK_END)
+            h.update(f.read(block))
+        elif size > block:
+            h.update(f.read())
+
+    return h.hexdigest()
+
+
+# -------------------------------------------------------------------
+# Many files
+# -------------------------------------------------------------------
+
+def hash_files(paths: Sequence[Path], workers: Optional[int] = None) -> Dict[Path, str]:
+    """
+    Full SHA-256 of many files on a thread pool.
+    """
+    if len(paths) <= 1:
+        return {p: sha256_file(p) for p in paths}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(sha256_file, paths)))
+
+
+def find_identical_files(
+    paths: Sequence[Path],
+    workers: Optional[int] = None,
+) -> List[List[Path]]:
+    """
+    Groups of byte-identical files.
+
+    Files are narrowed by size, then by pre-hash; only files whose
+    pre-hash collides get a full SHA-256.
+    """
+    by_size: Dict[int, List[Path]] = {}
+    for p in paths:
+        by_size.setdefault(p.stat().st_size, []).append(p)
+
+    same_size = [p for group in by_size.values() if len(group) > 1 for p in group]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        by_prehash: Dict[str, List[Path]] = {}
+        for p, pre in zip(same_size, pool.map(prehash_file, same_size)):
+            by_prehash.setdefault(pre, []).append(p)
+
+        suspects = [p for group in by_prehash.values() if len(group) > 1 for p in group]
+
+        by_digest: Dict[str, List[Path]] = {}
+        for p, digest in zip(suspects, pool.map(sha256_file, suspects)):
+            by_digest.setdefault(digest, []).append(p)
+
+    return [group for group in by_digest.values() if len(group) > 1]
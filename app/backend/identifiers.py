@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import fitz  # PyMuPDF
+
+
+# -------------------------------------------------------------------
+# Identifier patterns
+# -------------------------------------------------------------------
+
+DOI_PATTERN = r"\b10\.\d{4,9}/[-._;()/:A-Z0-9]+\b"
+
+ARXIV_PATTERN = (
+    r"(?:\barXiv:\s*|arxiv\.org/(?:abs|pdf)/)"
+    r"(?:\d{4}\.\d{4,5}|[a-z-]+(?:\.[a-z]{2})?/\d{7})(?:v\d+)?"
+)
+
+ISBN_PATTERN = r"\bISBN(?:-1[03])?:?\s*(?:97[89][-\s]?)?(?:\d[-\s]?){9}[\dX]\b"
+
+# One pass over the text finds every identifier kind
+IDENTIFIER_RE = re.compile(
+    rf"(?P<doi>{DOI_PATTERN})|(?P<arxiv>{ARXIV_PATTERN})|(?P<isbn>{ISBN_PATTERN})",
+    re.IGNORECASE,
+)
+
+IDENTIFIER_KINDS = ("doi", "arxiv", "isbn")
+
+_ARXIV_PREFIX_RE = re.compile(r"^(?:arXiv:\s*|arxiv\.org/(?:abs|pdf)/)", re.IGNORECASE)
+_ISBN_PREFIX_RE = re.compile(r"^ISBN(?:-1[03])?:?\s*", re.IGNORECASE)
+
+# PDF metadata fields that sometimes carry identifiers
+_METADATA_FIELDS = ("subject", "keywords", "title")
+
+
+# -------------------------------------------------------------------
+# Text scanning
+# -------------------------------------------------------------------
+
+def _clean(kind: str, raw: str) -> Optional[str]:
+    if kind == "doi":
+        return raw.strip()
+    if kind == "arxiv":
+        return _ARXIV_PREFIX_RE.sub("", raw).strip()
+
+    digits = re.sub(r"[-\s]", "", _ISBN_PREFIX_RE.sub("", raw)).upper()
+    return digits if len(digits) in (10, 13) else None
+
+
+def extract_identifiers(
+    text: str,
+    found: Optional[Dict[str, str]] = None,
+    kinds: Iterable[str] = IDENTIFIER_KINDS,
+) -> Dict[str, str]:
+    """
+    Scan text once for DOI / arXiv ID / ISBN.
+
+    Kinds already present in `found` are kept; the scan stops as soon
+    as every requested kind has been found.
+    """
+    found = dict(found or {})
+    wanted = {k for k in kinds if k not in found}
+    if not wanted or not text:
+        return found
+
+    for m in IDENTIFIER_RE.finditer(text):
+        kind = m.lastgroup
+        if kind not in wanted:
+            continue
+
+        value = _clean(kind, m.group(0))
+        if value:
+            found[kind] = value
+            wanted.discard(kind)
+            if not wanted:
+                break
+
+    return found
+
+
+# -------------------------------------------------------------------
+# PDF identifier stage
+# -------------------------------------------------------------------
+
+def extract_pdf_identifiers(
+    path: Path,
+    max_pages: int = 2,
+    max_chars: int = 20000,
+) -> Dict[str, Optional[str]]:
+    """
+    Extract title, author and identifiers from a PDF, opening it once.
+
+    Order:
+    1. PDF info dictionary and XMP metadata
+    2. page text (first pages), only if no DOI was found yet
+
+    Page scanning stops at the first DOI or after `max_chars`.
+    """
+    doc = fitz.open(str(path))
+    try:
+        md = doc.metadata or {}
+        title = (md.get("title") or "").strip()
+        author = (md.get("author") or "").strip()
+
+        meta_text = "\n".join(md.get(k) or "" for k in _METADATA_FIELDS)
+        xmp = doc.get_xml_metadata() or ""
+
+        ids = extract_identifiers(meta_text)
+        if "doi" not in ids:
+            ids = extract_identifiers(xmp, ids)
+        source = "metadata" if "doi" in ids else None
+
+        if "doi" not in ids:
+            budget = max_chars
+            for i in range(min(max_pages, doc.page_count)):
+                page_text = doc.load_page(i).get_text("text")[:budget]
+                ids = extract_identifiers(page_text, ids)
+                budget -= len(page_text)
+                if "doi" in ids:
+                    source = "text"
+                    break
+                if budget <= 0:
+                    break
+    finally:
+        doc.close()
+
+    return {
+        "title": title,
+        "author": author,
+        "doi": ids.get("doi"),
+        "arxiv_id": ids.get("arxiv"),
+        "isbn": ids.get("isbn"),
+        "doi_source": source,
+    }
+
+
+# -------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------
+
+def benchmark_identifiers(paths: List[Path]) -> Dict:
+    """
+    Time the identifier stage over a set of PDFs.
+
+    Reports total seconds, seconds per 1k PDFs and where DOIs were found.
+    """
+    by_source: Dict[str, int] = {"metadata": 0, "text": 0, "none": 0}
+    errors = 0
+
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            info = extract_pdf_identifiers(path)
+        except Exception:
+            errors += 1
+            continue
+        by_source[info["doi_source"] or "none"] += 1
+    elapsed = time.perf_counter() - start
+
+    count = len(paths)
+    return {
+        "pdfs": count,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "seconds_per_1k": round(elapsed * 1000 / count, 3) if count else 0.0,
+        "doi_by_source": by_source,
+    }
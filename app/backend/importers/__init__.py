@@ -0,0 +1 @@
+from app.backend.importers.bulk import import_file, import_records
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Entry types that carry no paper record
+_SKIP_TYPES = {"comment", "string", "preamble"}
+
+_ENTRY_START_RE = re.compile(r"@\s*(\w+)\s*\{")
+
+
+# -------------------------------------------------------------------
+# Streaming entry reader
+# -------------------------------------------------------------------
+
+def _iter_entries(path: Path) -> Iterator[str]:
+    """
+    Yield raw entry texts ("@type{key, ...}") one at a time.
+
+    The file is read line by line; only the current entry is buffered.
+    """
+    buf: List[str] = []
+    depth = 0
+
+    with path.open("r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not buf:
+                m = _ENTRY_START_RE.search(line)
+                if not m:
+                    continue
+                line = line[m.start():]
+
+            buf.append(line)
+            depth += line.count("{") - line.count("}")
+
+            if depth <= 0:
+                yield "".join(buf)
+                buf = []
+                depth = 0
+
+    if buf:
+        yield "".join(buf)
+
+
+# -------------------------------------------------------------------
+# Entry parsing
+# -------------------------------------------------------------------
+
+def _read_value(body: str, i: int) -> Tuple[str, int]:
+    """
+    Read a field value starting at body[i]; return (value, next index).
+    """
+    n = len(body)
+    parts: List[str] = []
+
+    while i < n:
+        c = body[i]
+        if c == "{":
+            depth = 0
+            start = i
+            while i < n:
+                if body[i] == "{":
+                    depth += 1
+                elif body[i] == "}":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            parts.append(body[start + 1:i])
+            i += 1
+        elif c == '"':
+            start = i + 1
+            i += 1
+            depth = 0
+            while i < n and not (body[i] == '"' and depth == 0 and body[i - 1] != "\\"):
+                if body[i] == "{":
+                    depth += 1
+                elif body[i] == "}":
+                    depth -= 1
+                i += 1
+            parts.append(body[start:i])
+            i += 1
+        else:
+            start = i
+            while i < n and body[i] not in ",#}\n":
+                i += 1
+            parts.append(body[start:i].strip())
+
+        # "a" # "b" concatenation
+        while i < n and body[i] in " \t\r\n":
+            i += 1
+        if i < n and body[i] == "#":
+            i += 1
+            while i < n and body[i] in " \t\r\n":
+                i += 1
+            continue
+        break
+
+    return "".join(parts), i
+
+
+def _clean(value: str) -> str:
+    value = value.replace("{", "").replace("}", "")
+    return " ".join(value.split())
+
+
+def parse_entry(raw: str) -> Optional[Dict[str, str]]:
+    """
+    Parse one BibTeX entry into a lowercase field dict.
+
+    Returns None for @comment / @string / @preamble and malformed entries.
+    """
+    m = _ENTRY_START_RE.match(raw)
+    if not m or m.group(1).lower() in _SKIP_TYPES:
+        return None
+
+    body = raw[m.end():]
+    comma = body.find(",")
+    if comma < 0:
+        return None
+
+    fields: Dict[str, str] = {"entry_type": m.group(1).lower()}
+    i = comma + 1
+    n = len(body)
+
+    while i < n:
+        eq = body.find("=", i)
+        if eq < 0:
+            break
+
+        name = body[i:eq].strip().strip(",").strip().lower()
+        j = eq + 1
+        while j < n and body[j] in " \t\r\n":
+            j += 1
+
+        value, i = _read_value(body, j)
+        if name:
+            fields[name] = _clean(value)
+
+        while i < n and body[i] in ", \t\r\n":
+            i += 1
+
+    return fields
+
+
+# -------------------------------------------------------------------
+# Record mapping
+# -------------------------------------------------------------------
+
+def _year(value: str) -> Optional[int]:
+    m = re.search(r"\d{4}", value or "")
+    return int(m.group(0)) if m else None
+
+
+def iter_bibtex(path: Path) -> Iterator[Dict]:
+    """
+    Stream import records from a BibTeX file.
+    """
+    for raw in _iter_entries(path):
+        fields = parse_entry(raw)
+        if not fields or not fields.get("title"):
+            continue
+
+        authors = fields.get("author", "")
+        yield {
+            "title": fields["title"],
+            "authors": [a.strip() for a in re.split(r"\s+and\s+", authors) if a.strip()],
+            "year": _year(fields.get("year", "")),
+            "venue": fields.get("journal") or fields.get("booktitle") or "",
+            "doi": fields.get("doi") or None,
+            "arxiv_id": fields.get("eprint") or None,
+            "abstract": fields.get("abstract", ""),
+        }
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from sqlmodel import text
+
+from app.backend.db import engine
+from app.backend.models import Paper
+from app.backend.fts import index_papers
+from app.backend.facets import bump_facets, paper_facet_counts
+from app.backend.changes import paper_created, record_changes
+from app.backend.related import update_related_index
+from app.backend.semantic import refresh_vector_index
+from app.backend.authors import link_paper_authors, load_author_ids, normalize_author
+from app.backend.dedup.normalize import normalize_doi, paper_keys
+from app.backend.importers.bibtex import iter_bibtex
+from app.backend.importers.ris import iter_ris
+from app.backend.importers.csv_import import iter_csv
+
+
+# -------------------------------------------------------------------
+# Formats
+# -------------------------------------------------------------------
+
+PARSERS: Dict[str, Callable[[Path], Iterator[Dict]]] = {
+    "bibtex": iter_bibtex,
+    "ris": iter_ris,
+    "csv": iter_csv,
+}
+
+SUFFIX_FORMATS = {
+    ".bib": "bibtex",
+    ".bibtex": "bibtex",
+    ".ris": "ris",
+    ".csv": "csv",
+}
+
+
+def detect_format(path: Path) -> str:
+    fmt = SUFFIX_FORMATS.get(path.suffix.lower())
+    if not fmt:
+        raise ValueError(f"Unsupported import format: {path.name}")
+    return fmt
+
+
+# -------------------------------------------------------------------
+# Bulk writer
+# -------------------------------------------------------------------
+
+def _batches(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    it = iter(records)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_records(records: Iterable[Dict], batch_size: int = 10000) -> Dict:
+    """
+    Write import records to the library in large batches.
+
+    - DOI dedup against an in-memory set of existing DOIs (loaded once)
+    - authors resolved through an in-memory name -> id map
+    - papers, authors and links written with executemany,
+      one transaction per batch
+    - new papers added to the FTS index, facet counts and change feed
+    - related-paper lists refreshed after the last batch
+    """
+    imported = 0
+    skipped = 0
+
+    with engine.connect() as conn:
+        known_dois: Set[str] = {
+            row[0]
+            for row in conn.execute(
+                text("SELECT doi_normalized FROM paper WHERE doi_normalized IS NOT NULL")
+            )
+        }
+        author_ids = load_author_ids(conn)
+
+        for batch in _batches(records, batch_size):
+            now = datetime.utcnow()
+            paper_rows: List[Dict] = []
+            paper_authors: List[Tuple[str, str]] = []
+            changes: List[Dict] = []
+
+            for rec in batch:
+                doi_n = normalize_doi(rec.get("doi"))
+                if doi_n:
+                    if doi_n in known_dois:
+                        skipped += 1
+                        continue
+                    known_dois.add(doi_n)
+
+                paper_id = str(uuid4())
+                paper_rows.append(
+                    {
+                        "id": paper_id,
+                        "title": rec["title"],
+                        "abstract": rec.get("abstract") or "",
+                        "year": rec.get("year"),
+                        "venue": rec.get("venue") or "",
+                        "doi": rec.get("doi"),
+                        "arxiv_id": rec.get("arxiv_id"),
+                        "created_at": now,
+                        "updated_at": now,
+                        **paper_keys(rec["title"], rec.get("doi")),
+                    }
+                )
+                names = [n for n in map(normalize_author, rec.get("authors") or []) if n]
+                paper_authors.extend((paper_id, name) for name in names)
+                changes.append(paper_created({**paper_rows[-1], "authors": names}))
+
+            if not paper_rows:
+                continue
+
+            conn.execute(Paper.__table__.insert(), paper_rows)
+            link_paper_authors(conn, paper_authors, author_ids)
+            index_papers(conn, [r["id"] for r in paper_rows])
+            bump_facets(conn, paper_facet_counts(paper_rows))
+            record_changes(conn, changes)
+
+            conn.commit()
+            imported += len(paper_rows)
+
+    if imported:
+        update_related_index()
+        refresh_vector_index()
+
+    return {"imported": imported, "skipped_doi": skipped}
+
+
+def import_file(path: Path, fmt: Optional[str] = None, batch_size: int = 10000) -> Dict:
+    """
+    Stream-import a BibTeX / RIS / CSV file into the library.
+    """
+    if not path.exists():
+        raise FileNotFoundError(str(path))
+
+    fmt = fmt or detect_format(path)
+    if fmt not in PARSERS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    start = time.perf_counter()
+    stats = import_records(PARSERS[fmt](path), batch_size=batch_size)
+    stats["format"] = fmt
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
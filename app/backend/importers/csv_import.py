@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+def _year(value: str) -> Optional[int]:
+    value = (value or "").strip()
+    return int(value) if value.isdigit() else None
+
+
+def iter_csv(path: Path) -> Iterator[Dict]:
+    """
+    Stream import records from a CSV file.
+
+    Columns follow `export_csv` (title, authors, year, venue, doi);
+    authors are "; "-separated. Extra columns are ignored.
+    """
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            title = (row.get("title") or "").strip()
+            if not title:
+                continue
+
+            authors = row.get("authors") or ""
+            yield {
+                "title": title,
+                "authors": [a.strip() for a in authors.split(";") if a.strip()],
+                "year": _year(row.get("year", "")),
+                "venue": (row.get("venue") or "").strip(),
+                "doi": (row.get("doi") or "").strip() or None,
+                "arxiv_id": (row.get("arxiv_id") or "").strip() or None,
+                "abstract": (row.get("abstract") or "").strip(),
+            }
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+_LINE_RE = re.compile(r"^([A-Z][A-Z0-9])  -\s?(.*)$")
+
+_TITLE_TAGS = ("TI", "T1")
+_YEAR_TAGS = ("PY", "Y1", "DA")
+_VENUE_TAGS = ("JO", "JF", "T2", "JA", "BT")
+_ABSTRACT_TAGS = ("AB", "N2")
+_AUTHOR_TAGS = ("AU", "A1")
+
+
+def _first(fields: Dict[str, List[str]], tags) -> str:
+    for tag in tags:
+        values = fields.get(tag)
+        if values:
+            return values[0]
+    return ""
+
+
+def _year(value: str) -> Optional[int]:
+    m = re.search(r"\d{4}", value or "")
+    return int(m.group(0)) if m else None
+
+
+def _to_record(fields: Dict[str, List[str]]) -> Optional[Dict]:
+    title = _first(fields, _TITLE_TAGS)
+    if not title:
+        return None
+
+    authors: List[str] = []
+    for tag in _AUTHOR_TAGS:
+        authors.extend(fields.get(tag, []))
+
+    return {
+        "title": title,
+        "authors": authors,
+        "year": _year(_first(fields, _YEAR_TAGS)),
+        "venue": _first(fields, _VENUE_TAGS),
+        "doi": _first(fields, ("DO",)) or None,
+        "arxiv_id": None,
+        "abstract": _first(fields, _ABSTRACT_TAGS),
+    }
+
+
+def iter_ris(path: Path) -> Iterator[Dict]:
+    """
+    Stream import records from a RIS file (TY ... ER blocks).
+    """
+    fields: Dict[str, List[str]] = {}
+    last_tag: Optional[str] = None
+
+    with path.open("r", encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            m = _LINE_RE.match(line)
+
+            if not m:
+                # Continuation of a wrapped value
+                if last_tag and line.strip() and fields.get(last_tag):
+                    fields[last_tag][-1] += " " + line.strip()
+                continue
+
+            tag, value = m.group(1), m.group(2).strip()
+
+            if tag == "TY":
+                fields = {}
+            elif tag == "ER":
+                record = _to_record(fields)
+                if record:
+                    yield record
+                fields = {}
+                last_tag = None
+                continue
+
+            fields.setdefault(tag, []).append(value)
+            last_tag = tag
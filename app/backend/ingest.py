@@ -1,133 +1,175 @@
 from __future__ import annotations
 
-import hashlib
-import re
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
-import fitz  # PyMuPDF
 from sqlmodel import select
 
-from app.backend.db import get_session
+from app.backend.db import chunked, get_session
 from app.backend.models import Paper
-from app.backend.fts import rebuild_fts
+from app.backend.fts import index_papers
+from app.backend.authors import link_paper_authors, load_author_ids, split_authors
+from app.backend.dedup.normalize import normalize_doi, paper_keys
+from app.backend.identifiers import extract_pdf_identifiers
+from app.backend.hashing import hash_files, sha256_file  # noqa: F401 (re-export)
+from app.backend.thumbnails import render_thumbnails
+from app.backend.related import update_related_index
+from app.backend.semantic import refresh_vector_index
+from app.backend.changes import paper_created, record_changes
 
 
 # -------------------------------------------------------------------
-# DOI detection
-# -------------------------------------------------------------------
-
-DOI_RE = re.compile(
-    r"\b10\.\d{4,9}/[-._;()/:A-Z0-9]+\b",
-    re.IGNORECASE,
-)
-
-
-# -------------------------------------------------------------------
-# Helpers
+# Ingest
 # -------------------------------------------------------------------
 
-def sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            h.update(chunk)
-    return h.hexdigest()
-
-
-def extract_pdf_text_first_pages(
-    path: Path,
-    max_pages: int = 2,
-    max_chars: int = 20000,
-) -> str:
-    doc = fitz.open(str(path))
-    parts = []
-    pages = min(max_pages, doc.page_count)
-
-    for i in range(pages):
-        parts.append(doc.load_page(i).get_text("text"))
-        if sum(len(p) for p in parts) > max_chars:
-            break
+def _check_pdf(path: Path) -> None:
+    if not path.exists():
+        raise FileNotFoundError(str(path))
 
-    doc.close()
-    return "\n".join(parts)[:max_chars]
+    if path.suffix.lower() != ".pdf":
+        raise ValueError(f"Only PDF supported for MVP. Got: {path.name}")
 
 
-def extract_pdf_metadata(path: Path) -> Tuple[str, str]:
+def ingest_pdfs(
+    paths: Sequence[Path],
+    batch_size: int = 100,
+    thumbnails: bool = True,
+) -> List[dict]:
     """
-    Return (title, author) from PDF metadata if present.
+    Ingest PDFs into the library, one transaction per batch.
+
+    - Hash-based dedup against the library and within the batch
+      (known files are not extracted again)
+    - DOI-based dedup (one indexed lookup per batch)
+    - Authors split/normalized from PDF metadata and bulk linked
+      through an in-memory name -> id map
+    - New papers added to FTS incrementally
+    - First-page thumbnails rendered after the last batch (process pool)
+    - Related-paper lists refreshed for the new papers
+    - New papers appended to the change feed
+    - Paper creation only (no file table yet)
     """
-    doc = fitz.open(str(path))
-    md = doc.metadata or {}
-    doc.close()
+    for path in paths:
+        _check_pdf(path)
+
+    results: List[dict] = []
+    author_ids: Optional[Dict[str, int]] = None
+    thumb_files: List[Tuple[Path, str]] = []
+
+    for batch in chunked(list(paths), batch_size):
+        # Hash the batch concurrently
+        hashes = hash_files(batch)
+
+        # Hash-level dedup against the library (one indexed lookup per batch)
+        with get_session() as session:
+            by_hash: Dict[str, Paper] = {
+                p.file_sha256: p
+                for p in session.exec(
+                    select(Paper).where(Paper.file_sha256.in_(sorted(set(hashes.values()))))
+                ).all()
+            }
+
+        # Extract metadata + identifiers (metadata/XMP first, then page text)
+        # for unknown files only; identical files are extracted once
+        infos: Dict[str, dict] = {}
+        extracted = []
+        for path in batch:
+            file_hash = hashes[path]
+            if file_hash not in by_hash and file_hash not in infos:
+                infos[file_hash] = extract_pdf_identifiers(path)
+            extracted.append((path, file_hash, infos.get(file_hash)))
+
+        with get_session() as session:
+            conn = session.connection()
+            if author_ids is None:
+                author_ids = load_author_ids(conn)
+
+            # DOI-level dedup
+            by_doi: Dict[str, Paper] = {}
+            dois = sorted({normalize_doi(info["doi"]) for info in infos.values() if info["doi"]})
+            if dois:
+                for existing in session.exec(
+                    select(Paper).where(Paper.doi_normalized.in_(dois))
+                ).all():
+                    by_doi[existing.doi_normalized] = existing
+
+            new_ids: List[str] = []
+            changes: List[dict] = []
+            links: List[Tuple[str, str]] = []
+
+            for path, file_hash, info in extracted:
+                paper: Optional[Paper] = by_hash.get(file_hash)
+                doi = info["doi"] if paper is None else paper.doi
+                doi_n = normalize_doi(doi)
+                if paper is None and doi_n:
+                    paper = by_doi.get(doi_n)
+
+                # Create paper if needed
+                if paper is None:
+                    title = info["title"] or path.stem
+                    paper = Paper(
+                        id=str(uuid4()),
+                        title=title,
+                        abstract="",
+                        year=None,
+                        venue="",
+                        doi=doi,
+                        arxiv_id=info["arxiv_id"],
+                        file_sha256=file_hash,
+                        **paper_keys(title, doi),
+                    )
+                    session.add(paper)
+                    if doi_n:
+                        by_doi[doi_n] = paper
+                    new_ids.append(paper.id)
+                    by_hash[file_hash] = paper
+                    thumb_files.append((path, file_hash))
+                    authors = split_authors(info["author"])
+                    links.extend((paper.id, name) for name in authors)
+                    changes.append(
+                        paper_created(
+                            {
+                                "id": paper.id,
+                                "title": title,
+                                "doi": doi,
+                                "arxiv_id": info["arxiv_id"],
+                                "authors": authors,
+                            }
+                        )
+                    )
+
+                results.append(
+                    {
+                        "status": "ingested",
+                        "paper_id": paper.id,
+                        "title": paper.title,
+                        "doi": paper.doi,
+                        "arxiv_id": paper.arxiv_id,
+                        "isbn": info["isbn"] if info else None,
+                        "file_path": str(path.resolve()),
+                        "sha256": file_hash,
+                    }
+                )
+
+            session.flush()
+            link_paper_authors(conn, links, author_ids)
+            index_papers(conn, new_ids)
+            record_changes(conn, changes)
+            session.commit()
 
-    title = (md.get("title") or "").strip()
-    author = (md.get("author") or "").strip()
-    return title, author
+    if thumbnails and thumb_files:
+        render_thumbnails(thumb_files)
 
+    if thumb_files:
+        update_related_index()
+        refresh_vector_index()
 
-def detect_doi(text: str) -> Optional[str]:
-    m = DOI_RE.search(text)
-    return m.group(0).strip() if m else None
+    return results
 
 
-# -------------------------------------------------------------------
-# Ingest
-# -------------------------------------------------------------------
-
 def ingest_pdf(path: Path) -> dict:
     """
     Ingest a single PDF into the library (MVP).
-
-    - Hash-based dedup
-    - DOI-based dedup
-    - Paper creation only (no file table yet)
     """
-    if not path.exists():
-        raise FileNotFoundError(str(path))
-
-    if path.suffix.lower() != ".pdf":
-        raise ValueError(f"Only PDF supported for MVP. Got: {path.name}")
-
-    file_hash = sha256_file(path)
-
-    # Extract text + metadata
-    title, author = extract_pdf_metadata(path)
-    text = extract_pdf_text_first_pages(path)
-    doi = detect_doi(text)
-
-    with get_session() as session:
-        # DOI-level dedup
-        paper: Optional[Paper] = None
-        if doi:
-            paper = session.exec(
-                select(Paper).where(Paper.doi == doi)
-            ).first()
-
-        # Create paper if needed
-        if paper is None:
-            paper = Paper(
-                id=str(uuid4()),
-                title=title or path.stem,
-                abstract="",
-                year=None,
-                venue="",
-                doi=doi,
-                arxiv_id=None,
-            )
-            session.add(paper)
-            session.commit()
-            session.refresh(paper)
-
-    # Rebuild FTS after ingest (MVP-safe)
-    rebuild_fts()
-
-    return {
-        "status": "ingested",
-        "paper_id": paper.id,
-        "title": paper.title,
-        "doi": paper.doi,
-        "file_path": str(path.resolve()),
-        "sha256": file_hash,
-    }
+    return ingest_pdfs([path])[0]
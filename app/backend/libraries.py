@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from app.backend.db import (
+    DEFAULT_LIBRARY,
+    init_db,
+    library_path,
+    list_libraries,
+    use_library,
+)
+from app.backend.fts import ensure_fts
+from app.backend.search import fts_search
+
+
+# -------------------------------------------------------------------
+# Opening libraries
+# -------------------------------------------------------------------
+
+_ready = set()
+_ready_lock = threading.Lock()
+
+
+def open_library(name: str, create: bool = False) -> str:
+    """
+    Make sure a library's schema and FTS tables exist (once per process).
+
+    Unknown libraries are only created with `create=True`,
+    so a request cannot create database files by naming one.
+    """
+    path = library_path(name)  # validates the name
+    if name in _ready:
+        return name
+
+    with _ready_lock:
+        if name in _ready:
+            return name
+        if not path.exists() and not create and name != DEFAULT_LIBRARY:
+            raise ValueError(f"Library not found: {name}")
+
+        with use_library(name):
+            init_db()
+            ensure_fts()
+        _ready.add(name)
+
+    return name
+
+
+# -------------------------------------------------------------------
+# Federated search
+# -------------------------------------------------------------------
+
+def _search_library(name: str, query: str, limit: int) -> List[dict]:
+    with use_library(name):
+        return [{**r, "library": name} for r in fts_search(query, limit)]
+
+
+def federated_search(
+    query: str,
+    libraries: Optional[Sequence[str]] = None,
+    limit: int = 50,
+) -> Dict:
+    """
+    Run an FTS query against several libraries in parallel threads.
+
+    Each library returns its own top `limit` hits; the lists are merged
+    by bm25 (lower is better). bm25 depends on each library's term
+    statistics, so cross-library ranks are comparable, not identical.
+    """
+    names = list(libraries) if libraries else list_libraries()
+    for name in names:
+        open_library(name)
+
+    errors: Dict[str, str] = {}
+    hits: List[dict] = []
+
+    # SQLite releases the GIL while searching: one thread per library
+    with ThreadPoolExecutor(max_workers=min(len(names), 8) or 1) as pool:
+        futures = {name: pool.submit(_search_library, name, query, limit) for name in names}
+        for name, future in futures.items():
+            try:
+                hits.extend(future.result())
+            except Exception as e:
+                errors[name] = str(e)
+
+    hits.sort(key=lambda r: r["rank"])
+    return {"results": hits[:limit], "libraries": names, "errors": errors}
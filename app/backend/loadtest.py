@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import http.client
+import random
+import socket
+import statistics
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+import uvicorn
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import text
+
+from app.backend.db import engine, use_library
+from app.backend.importers import import_records
+from app.backend.ingest import ingest_pdfs
+from app.backend.libraries import open_library
+from app.backend.main import app
+
+
+# -------------------------------------------------------------------
+# Configuration
+# -------------------------------------------------------------------
+
+# Scratch library the load test writes to (tags, ingests)
+LOADTEST_LIBRARY = "loadtest"
+
+# Operation -> relative weight
+DEFAULT_MIX = {
+    "search": 40,
+    "papers": 20,
+    "tag": 20,
+    "export": 10,
+    "ingest": 10,
+}
+
+_WORDS = (
+    "adaptive array beamforming channel compressed deep detection distributed "
+    "estimation graph learning mimo network optimal phased radar robust sensing "
+    "signal sparse spectrum tracking wireless"
+).split()
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    """
+    "search=40,tag=20" -> {"search": 40, "tag": 20}
+    """
+    mix: Dict[str, int] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        op, _, weight = part.partition("=")
+        op = op.strip()
+        if op not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation: {op}")
+        mix[op] = int(weight or 1)
+    return mix
+
+
+# -------------------------------------------------------------------
+# Lock errors (counted on every engine, server and in-process)
+# -------------------------------------------------------------------
+
+_lock_errors = 0
+_lock_errors_mutex = threading.Lock()
+
+
+def _count_lock_error(context) -> None:
+    global _lock_errors
+    if "database is locked" in str(context.original_exception):
+        with _lock_errors_mutex:
+            _lock_errors += 1
+
+
+# -------------------------------------------------------------------
+# Fixtures
+# -------------------------------------------------------------------
+
+def _seed_library(papers: int, rng: random.Random) -> List[str]:
+    """
+    Fill the scratch library with synthetic papers (if empty); returns paper ids.
+    """
+    with engine.connect() as conn:
+        existing = conn.execute(text("SELECT COUNT(*) FROM paper")).scalar()
+
+    if not existing:
+        import_records(
+            {
+                "title": " ".join(rng.sample(_WORDS, 6)).capitalize(),
+                "abstract": " ".join(rng.choices(_WORDS, k=40)),
+                "year": rng.randint(1995, 2025),
+                "venue": rng.choice(["IEEE TSP", "IEEE TAP", "ICASSP", "NeurIPS"]),
+                "authors": [f"Author {rng.randint(1, papers // 5 + 1)}" for _ in range(3)],
+            }
+            for _ in range(papers)
+        )
+
+    with engine.connect() as conn:
+        return [r[0] for r in conn.execute(text("SELECT id FROM paper"))]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int) -> Tuple[uvicorn.Server, threading.Thread]:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, name="rle-loadtest-server", daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline or not thread.is_alive():
+            raise RuntimeError("Server did not start")
+        time.sleep(0.05)
+    return server, thread
+
+
+# -------------------------------------------------------------------
+# Clients
+# -------------------------------------------------------------------
+
+Request = Tuple[str, str]  # (method, path)
+
+
+def _request_for(op: str, rng: random.Random, paper_ids: Sequence[str], library: str) -> Request:
+    lib = {"library": library}
+    if op == "search":
+        params = {"q": rng.choice(_WORDS), "limit": 20, **lib}
+        if rng.random() < 0.5:
+            params["notes"] = "true"  # FTS path
+        return "GET", "/search?" + urlencode(params)
+    if op == "papers":
+        return "GET", "/papers?" + urlencode({"limit": 100, "offset": rng.randint(0, 500), **lib})
+    if op == "tag":
+        pid = rng.choice(paper_ids)
+        tag = f"load-{rng.randint(1, 20)}"
+        return "POST", f"/papers/{pid}/tags?" + urlencode({"tag": tag, **lib})
+    if op == "export":
+        fmt = rng.choice(["bibtex", "csv", "markdown", "ieee"])
+        year = rng.randint(1995, 2025)
+        params = {"year_from": year, "year_to": year + 2, **lib}
+        return "GET", f"/export/{fmt}?" + urlencode(params)
+    raise ValueError(op)
+
+
+def _client(
+    port: int,
+    ops: List[str],
+    weights: List[int],
+    deadline: float,
+    max_requests: Optional[int],
+    rng: random.Random,
+    paper_ids: Sequence[str],
+    library: str,
+    pdfs: Sequence[Path],
+    samples: List[Tuple[str, float, bool]],
+) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    done = 0
+
+    while time.monotonic() < deadline and (max_requests is None or done < max_requests):
+        op = rng.choices(ops, weights)[0]
+        start = time.perf_counter()
+        ok = True
+
+        try:
+            if op == "ingest":
+                # No HTTP endpoint for ingest: run it in-process against the same DB
+                with use_library(library):
+                    ingest_pdfs([rng.choice(pdfs)], thumbnails=False)
+            else:
+                method, path = _request_for(op, rng, paper_ids, library)
+                conn.request(method, path)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status < 400
+        except Exception:
+            ok = False
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+
+        samples.append((op, time.perf_counter() - start, ok))
+        done += 1
+
+    conn.close()
+
+
+def _percentiles(latencies: List[float]) -> Dict[str, float]:
+    ms = sorted(x * 1000 for x in latencies)
+    if len(ms) < 2:
+        value = round(ms[0], 2) if ms else 0.0
+        return {"p50": value, "p90": value, "p99": value, "max": value}
+
+    q = statistics.quantiles(ms, n=100, method="inclusive")
+    return {
+        "p50": round(q[49], 2),
+        "p90": round(q[89], 2),
+        "p99": round(q[98], 2),
+        "max": round(ms[-1], 2),
+    }
+
+
+# -------------------------------------------------------------------
+# Runner
+# -------------------------------------------------------------------
+
+def run_load_test(
+    clients: int = 16,
+    duration: float = 30.0,
+    requests_per_client: Optional[int] = None,
+    mix: Optional[Dict[str, int]] = None,
+    pdf_dir: Optional[Path] = None,
+    seed_papers: int = 2000,
+    library: str = LOADTEST_LIBRARY,
+    seed: int = 0,
+) -> Dict:
+    """
+    Start the API on a local uvicorn server and replay a weighted mix of
+    search / list / tag / export / ingest calls from concurrent clients.
+
+    Runs against a scratch library (seeded with synthetic papers) so the
+    real library is not modified. Ingest needs `pdf_dir`; without it the
+    ingest share is dropped from the mix.
+
+    Reports throughput, latency percentiles per operation and
+    "database is locked" errors seen by any engine in this process.
+    """
+    global _lock_errors
+    mix = dict(mix or DEFAULT_MIX)
+    pdfs = sorted(pdf_dir.rglob("*.pdf")) if pdf_dir else []
+    if not pdfs:
+        mix.pop("ingest", None)
+    mix = {op: w for op, w in mix.items() if w > 0}
+    if not mix:
+        raise ValueError("Empty operation mix")
+
+    rng = random.Random(seed)
+    open_library(library, create=True)
+    with use_library(library):
+        paper_ids = _seed_library(seed_papers, rng)
+
+    _lock_errors = 0
+    event.listen(Engine, "handle_error", _count_lock_error)
+    port = _free_port()
+    server, thread = _start_server(port)
+
+    samples: List[Tuple[str, float, bool]] = []
+    ops, weights = list(mix), list(mix.values())
+    deadline = time.monotonic() + duration
+    workers = [
+        threading.Thread(
+            target=_client,
+            args=(
+                port, ops, weights, deadline, requests_per_client,
+                random.Random(seed + i + 1), paper_ids, library, pdfs, samples,
+            ),
+        )
+        for i in range(clients)
+    ]
+
+    start = time.perf_counter()
+    try:
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+    finally:
+        elapsed = time.perf_counter() - start
+        server.should_exit = True
+        thread.join(timeout=10)
+        event.remove(Engine, "handle_error", _count_lock_error)
+
+    by_op: Dict[str, List[Tuple[float, bool]]] = defaultdict(list)
+    for op, latency, ok in samples:
+        by_op[op].append((latency, ok))
+
+    return {
+        "clients": clients,
+        "seconds": round(elapsed, 3),
+        "requests": len(samples),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed > 0 else 0.0,
+        "errors": sum(1 for _, _, ok in samples if not ok),
+        "lock_errors": _lock_errors,
+        "latency_ms": _percentiles([latency for _, latency, _ in samples]),
+        "operations": {
+            op: {
+                "requests": len(rows),
+                "errors": sum(1 for _, ok in rows if not ok),
+                "latency_ms": _percentiles([latency for latency, _ in rows]),
+            }
+            for op, rows in sorted(by_op.items())
+        },
+    }
+
+
+def format_report(stats: Dict) -> str:
+    lines = [
+        f"{stats['requests']} requests from {stats['clients']} clients "
+        f"in {stats['seconds']} s: {stats['throughput_rps']} req/s, "
+        f"{stats['errors']} errors, {stats['lock_errors']} lock errors",
+        "{:<8} {:>8} {:>7} {:>9} {:>9} {:>9} {:>9}".format(
+            "op", "requests", "errors", "p50 ms", "p90 ms", "p99 ms", "max ms"
+        ),
+    ]
+    total = {
+        "requests": stats["requests"],
+        "errors": stats["errors"],
+        "latency_ms": stats["latency_ms"],
+    }
+    for op, s in [*stats["operations"].items(), ("all", total)]:
+        lat = s["latency_ms"]
+        lines.append(
+            "{:<8} {:>8} {:>7} {:>9} {:>9} {:>9} {:>9}".format(
+                op, s["requests"], s["errors"], lat["p50"], lat["p90"], lat["p99"], lat["max"]
+            )
+        )
+    return "\n".join(lines)
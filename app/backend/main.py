@@ -1,13 +1,28 @@
 from __future__ import annotations
 
+import asyncio
+import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from urllib.parse import parse_qs
+from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Body, FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.exc import OperationalError
 from sqlmodel import select
 
-from app.backend.db import init_db, get_session
+from app.backend.db import init_db, get_session, list_libraries, use_library
+from app.backend.libraries import federated_search, open_library
+from app.backend.fts import ensure_fts
+from app.backend.maintenance import start_scheduler, stop_scheduler
+from app.backend.search import combined_search, is_query_error
+from app.backend.semantic import hybrid_search, semantic_search
+from app.backend.suggest import suggest
+from app.backend.related import related_papers
+from app.backend.thumbnails import thumbnail_path
 from app.backend.models import (
     Paper,
     Tag,
@@ -20,13 +35,21 @@ from app.backend.export import (
     export_markdown,
     export_csv,
 )
-from app.backend.dedup import find_possible_duplicates
+from app.backend.dedup import (
+    iter_possible_duplicates,
+    find_exact_duplicates,
+    list_dedup_clusters,
+    merge_papers,
+    merge_clusters,
+)
 from app.backend.projects import (
     create_project,
     list_projects,
     add_paper_to_project,
     list_papers_in_project,
 )
+from app.backend.facets import get_facets
+from app.backend.changes import POLL_INTERVAL, latest_seq, list_changes, poll_changes
 from app.backend.tags_notes import (
     add_tag_to_paper,
     list_tags_for_paper,
@@ -42,6 +65,54 @@ from app.backend.tags_notes import (
 app = FastAPI(title="Research Library Engine")
 
 
+class LibraryMiddleware:
+    """
+    Route a request to a library: ?library=<name> or an X-Library header.
+
+    Pure ASGI (not BaseHTTPMiddleware) so the selection also covers
+    streamed response bodies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        names = parse_qs(scope.get("query_string", b"").decode()).get("library")
+        name = names[0] if names else None
+        if name is None:
+            name = dict(scope["headers"]).get(b"x-library", b"").decode() or None
+        if name is None:
+            return await self.app(scope, receive, send)
+
+        try:
+            open_library(name)
+        except ValueError as e:
+            response = JSONResponse({"detail": str(e)}, status_code=400)
+            return await response(scope, receive, send)
+
+        with use_library(name):
+            await self.app(scope, receive, send)
+
+
+app.add_middleware(LibraryMiddleware)
+
+
+@contextmanager
+def fts_query():
+    """
+    Answer 400 (not 500) when FTS5 cannot parse a user query.
+    """
+    try:
+        yield
+    except OperationalError as e:
+        if not is_query_error(e):
+            raise
+        raise HTTPException(status_code=400, detail=f"Invalid search query: {e.orig}")
+
+
 # -------------------------------------------------------------------
 # Startup
 # -------------------------------------------------------------------
@@ -49,6 +120,13 @@ app = FastAPI(title="Research Library Engine")
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    ensure_fts()
+    start_scheduler()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    stop_scheduler()
 
 
 # -------------------------------------------------------------------
@@ -72,17 +150,101 @@ def list_papers(limit: int = 100, offset: int = 0) -> List[Paper]:
         ).all()
 
 
+@app.get("/papers/{paper_id}/thumbnail")
+def api_paper_thumbnail(paper_id: str, request: Request):
+    """
+    First-page PNG, pre-rendered at ingest (content-addressed by file SHA-256).
+    """
+    with get_session() as session:
+        paper = session.get(Paper, paper_id)
+        sha256 = paper.file_sha256 if paper else None
+
+    path = thumbnail_path(sha256) if sha256 else None
+    if path is None or not path.exists():
+        raise HTTPException(status_code=404, detail="No thumbnail")
+
+    # The file behind a paper rarely changes: cache for a day, then revalidate
+    etag = f'"{sha256}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(path, media_type="image/png", headers=headers)
+
+
+@app.get("/papers/{paper_id}/related")
+def api_related_papers(paper_id: str, limit: int = 10):
+    try:
+        return related_papers(paper_id, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 # -------------------------------------------------------------------
 # Search (simple metadata search placeholder)
 # -------------------------------------------------------------------
 
 @app.get("/search")
-def search_papers(q: str, limit: int = 50):
+def search_papers(
+    q: str,
+    limit: int = 50,
+    notes: bool = False,
+    mode: Optional[str] = None,
+    alpha: float = 0.5,
+):
+    if mode in ("semantic", "hybrid"):
+        # Vector search (hashed TF-IDF); hybrid blends in bm25
+        try:
+            if mode == "semantic":
+                return semantic_search(q, limit)
+            return hybrid_search(q, limit, alpha)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except RuntimeError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+
+    if notes:
+        # Combined ranking over paper_fts and note_fts
+        with fts_query():
+            return combined_search(q, limit)
+
     with get_session() as session:
         stmt = select(Paper).where(Paper.title.contains(q))
         return session.exec(stmt.limit(limit)).all()
 
 
+@app.get("/suggest")
+def api_suggest(prefix: str, limit: int = 8):
+    return suggest(prefix, limit)
+
+
+@app.get("/search/federated")
+def api_federated_search(q: str, libraries: Optional[str] = None, limit: int = 50):
+    """
+    bm25 search across libraries (comma-separated names, default all).
+    """
+    names = [n.strip() for n in libraries.split(",") if n.strip()] if libraries else None
+    try:
+        return federated_search(q, names, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/libraries")
+def api_list_libraries():
+    return list_libraries()
+
+
+# -------------------------------------------------------------------
+# Facets
+# -------------------------------------------------------------------
+
+@app.get("/facets")
+def api_facets(q: Optional[str] = None, limit: int = 50):
+    with fts_query():
+        return get_facets(q, limit)
+
+
 # -------------------------------------------------------------------
 # Tags
 # -------------------------------------------------------------------
@@ -146,8 +308,71 @@ def api_list_papers_in_project(project_id: int):
 # -------------------------------------------------------------------
 
 @app.get("/dedup/report")
-def api_dedup_report(threshold: float = 0.85):
-    return find_possible_duplicates(threshold)
+def api_dedup_report(
+    threshold: float = 0.85,
+    top_k: Optional[int] = None,
+    max_results: Optional[int] = None,
+):
+    """
+    Stream possible duplicate pairs as NDJSON (one pair per line).
+    """
+    try:
+        pairs = iter_possible_duplicates(threshold, top_k, max_results)
+        first = next(pairs, None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines():
+        if first is None:
+            return
+        yield json.dumps(first) + "\n"
+        for pair in pairs:
+            yield json.dumps(pair) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/dedup/clusters")
+def api_dedup_clusters(
+    threshold: float = 0.85,
+    limit: Optional[int] = None,
+    rebuild: bool = False,
+):
+    try:
+        return list_dedup_clusters(threshold, limit, rebuild)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/dedup/merge")
+def api_dedup_merge(
+    clusters: Optional[List[dict]] = Body(default=None),
+    pairs: Optional[List[List[str]]] = Body(default=None),
+    all_clusters: bool = Body(default=False),
+):
+    """
+    Merge duplicates (explicit, destructive).
+
+    - pairs: [[canonical_id, duplicate_id], ...]
+    - clusters: output of /dedup/clusters, posted as is ({cluster_id,
+      representative_id, papers}; `paper_ids` may replace `papers`);
+      rejected if a cluster was rebuilt since
+    - all_clusters: merge every persisted cluster
+    """
+    try:
+        if pairs:
+            return merge_papers((p[0], p[1]) for p in pairs)
+        if clusters or all_clusters:
+            return merge_clusters(None if all_clusters else clusters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    raise HTTPException(status_code=400, detail="Nothing to merge")
+
+
+@app.get("/dedup/exact")
+def api_dedup_exact():
+    return find_exact_duplicates()
 
 
 # -------------------------------------------------------------------
@@ -155,23 +380,103 @@ def api_dedup_report(threshold: float = 0.85):
 # -------------------------------------------------------------------
 
 @app.get("/export/bibtex")
-def api_export_bibtex():
-    return {"bibtex": export_bibtex()}
+def api_export_bibtex(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    q: Optional[str] = None,
+):
+    with fts_query():
+        return {"bibtex": export_bibtex(project_id, tag, year_from, year_to, q)}
 
 
 @app.get("/export/ieee")
-def api_export_ieee():
-    return {"ieee": export_ieee()}
+def api_export_ieee(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    q: Optional[str] = None,
+):
+    with fts_query():
+        return {"ieee": export_ieee(project_id, tag, year_from, year_to, q)}
 
 
 @app.get("/export/markdown")
-def api_export_markdown():
-    return {"markdown": export_markdown()}
+def api_export_markdown(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    q: Optional[str] = None,
+):
+    with fts_query():
+        return {"markdown": export_markdown(project_id, tag, year_from, year_to, q)}
 
 
 @app.get("/export/csv")
-def api_export_csv():
-    return {"csv": export_csv()}
+def api_export_csv(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    q: Optional[str] = None,
+):
+    with fts_query():
+        return {"csv": export_csv(project_id, tag, year_from, year_to, q)}
+
+
+# -------------------------------------------------------------------
+# Change feed
+# -------------------------------------------------------------------
+
+@app.get("/changes")
+async def api_changes(since: int = 0, limit: int = 1000, wait: float = 0.0):
+    """
+    Changes after `since` (oldest first); pass the returned `next` back.
+
+    wait > 0 long-polls up to that many seconds (max 30) for a non-empty page.
+    """
+    return await poll_changes(since, min(max(limit, 1), 10000), wait)
+
+
+@app.get("/changes/stream")
+async def api_changes_stream(request: Request, since: Optional[int] = None):
+    """
+    Server-sent events, one per change (event id = seq).
+
+    Resumes from Last-Event-ID or `since`; otherwise only new changes.
+    """
+    last_id = request.headers.get("last-event-id")
+    if last_id and last_id.isdigit():
+        since = int(last_id)
+    if since is None:
+        since = await run_in_threadpool(latest_seq)
+
+    async def events():
+        cursor = since
+        idle = 0.0
+        while not await request.is_disconnected():
+            page = await run_in_threadpool(list_changes, cursor, 1000)
+            for c in page["changes"]:
+                yield f"id: {c['seq']}\nevent: change\ndata: {json.dumps(c, default=str)}\n\n"
+            cursor = page["next"]
+            if page["more"]:
+                continue
+
+            await asyncio.sleep(POLL_INTERVAL)
+            idle = 0.0 if page["changes"] else idle + POLL_INTERVAL
+            if idle >= 15.0:
+                # Keep-alive comment for proxies
+                yield ": ping\n\n"
+                idle = 0.0
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 # -------------------------------------------------------------------
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.engine import Connection
+from sqlmodel import text
+
+from app.backend.db import engine, open_libraries, rows_written, use_library
+from app.backend.related import update_related_index
+from app.backend.semantic import refresh_vector_index
+
+
+FTS_TABLES = ("paper_fts", "note_fts")
+
+# Pages merged per FTS 'merge' step in light (scheduled) maintenance
+FTS_MERGE_PAGES = 500
+
+# Free pages released per incremental vacuum run
+VACUUM_PAGES = 2000
+
+
+# -------------------------------------------------------------------
+# Measurements
+# -------------------------------------------------------------------
+
+def fts_segment_counts(conn: Connection) -> Dict[str, int]:
+    """
+    Number of b-tree segments per FTS5 index (from its %_idx shadow table).
+    """
+    return {
+        table: conn.execute(text(f"SELECT COUNT(DISTINCT segid) FROM {table}_idx")).scalar() or 0
+        for table in FTS_TABLES
+    }
+
+
+def _timed_ms(fn: Callable[[], object], runs: int = 5) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def probe_latencies(conn: Connection) -> Dict[str, float]:
+    """
+    Median latency (ms) of a few representative queries.
+    """
+    row = conn.execute(
+        text("SELECT title FROM paper ORDER BY created_at DESC LIMIT 1")
+    ).first()
+    words = [w for w in (row[0] if row else "").split() if w.isalnum()]
+    term = f'"{words[0]}"' if words else '"paper"'
+
+    return {
+        "fts_match": _timed_ms(
+            lambda: conn.execute(
+                text(
+                    "SELECT rowid, bm25(paper_fts) AS rank FROM paper_fts "
+                    "WHERE paper_fts MATCH :q ORDER BY rank LIMIT 50"
+                ),
+                {"q": term},
+            ).all()
+        ),
+        "list_recent": _timed_ms(
+            lambda: conn.execute(
+                text("SELECT id, title FROM paper ORDER BY created_at DESC LIMIT 100")
+            ).all()
+        ),
+        "year_filter": _timed_ms(
+            lambda: conn.execute(
+                text("SELECT COUNT(*) FROM paper WHERE year >= 2000")
+            ).scalar()
+        ),
+    }
+
+
+def _snapshot(conn: Connection) -> Dict:
+    return {
+        "fts_segments": fts_segment_counts(conn),
+        "freelist_pages": conn.execute(text("PRAGMA freelist_count")).scalar(),
+        "latency_ms": probe_latencies(conn),
+    }
+
+
+# -------------------------------------------------------------------
+# Maintenance
+# -------------------------------------------------------------------
+
+def run_maintenance(full: bool = False, vacuum: bool = False) -> Dict:
+    """
+    Keep FTS indexes and SQLite statistics in shape.
+
+    - light (default): related-paper lists and vector store refreshed,
+      FTS5 'merge' steps, PRAGMA optimize, incremental vacuum (if auto_vacuum is
+      INCREMENTAL)
+    - full: FTS5 'optimize' (single segment) and ANALYZE
+    - vacuum: full VACUUM, switching auto_vacuum to INCREMENTAL
+
+    Returns before/after FTS segment counts and query latencies.
+    """
+    start = time.perf_counter()
+    steps = []
+
+    # Papers written without a refresh (bulk import, merges); runs on its
+    # own connection before the snapshot below opens a read transaction
+    related = update_related_index()
+    steps.append(f"related: {related['refreshed']} refreshed")
+    vectors = refresh_vector_index()
+    if vectors is not None:
+        steps.append(f"vectors: {vectors['embedded']} embedded, {vectors['removed']} removed")
+
+    with engine.connect() as conn:
+        before = _snapshot(conn)
+
+        for table in FTS_TABLES:
+            if full:
+                conn.execute(text(f"INSERT INTO {table}({table}) VALUES('optimize')"))
+                steps.append(f"{table}: optimize")
+            else:
+                conn.execute(
+                    text(f"INSERT INTO {table}({table}, rank) VALUES('merge', :pages)"),
+                    {"pages": FTS_MERGE_PAGES},
+                )
+                steps.append(f"{table}: merge {FTS_MERGE_PAGES}")
+        conn.commit()
+
+        if full:
+            conn.execute(text("ANALYZE"))
+            steps.append("analyze")
+        conn.execute(text("PRAGMA optimize"))
+        steps.append("pragma optimize")
+        conn.commit()
+
+        if vacuum:
+            conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+            conn.execute(text("VACUUM"))
+            steps.append("vacuum")
+        elif conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2:
+            conn.execute(text(f"PRAGMA incremental_vacuum({VACUUM_PAGES})"))
+            conn.commit()
+            steps.append(f"incremental_vacuum {VACUUM_PAGES}")
+
+        after = _snapshot(conn)
+
+    return {
+        "steps": steps,
+        "before": before,
+        "after": after,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+# -------------------------------------------------------------------
+# Background scheduler (server)
+# -------------------------------------------------------------------
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _scheduler_loop(interval: float, write_threshold: int, max_idle: float) -> None:
+    last_rows = rows_written()
+    last_run = time.monotonic()
+
+    while not _stop.wait(interval):
+        # Fold new changelog entries into the related lists and vectors:
+        # cheap when there are none, and covers other processes' writes
+        try:
+            for name in open_libraries():
+                with use_library(name):
+                    update_related_index()
+                    refresh_vector_index()
+        except Exception:
+            pass
+
+        pending = rows_written() - last_rows
+        overdue = pending > 0 and time.monotonic() - last_run >= max_idle
+        if pending < write_threshold and not overdue:
+            continue
+
+        try:
+            for name in open_libraries():
+                with use_library(name):
+                    run_maintenance()
+        except Exception:
+            # Maintenance is best-effort; retry on the next tick
+            continue
+
+        last_rows = rows_written()
+        last_run = time.monotonic()
+
+
+def start_scheduler(
+    interval: float = 60.0,
+    write_threshold: int = 1000,
+    max_idle: float = 6 * 3600.0,
+) -> None:
+    """
+    Run light maintenance in a daemon thread when enough rows were written
+    (or some writes are pending for longer than `max_idle` seconds),
+    on every library opened by this process.
+
+    Related-paper lists and the vector store are refreshed on every tick.
+    """
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_scheduler_loop,
+        args=(interval, write_threshold, max_idle),
+        name="rle-maintenance",
+        daemon=True,
+    )
+    _thread.start()
+
+
+def stop_scheduler() -> None:
+    _stop.set()
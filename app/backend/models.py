@@ -1,12 +1,27 @@
-raise RuntimeError(">>> THIS IS THE MODELS.PY BEING IMPORTED")
+from datetime import datetime
+from typing import List, Optional
+from uuid import uuid4
 
+from sqlmodel import SQLModel, Field, Relationship
 
 
-from datetime import datetime
-from typing import Optional
-from uuid import uuid4
+# -------------------------------------------------------------------
+# Link tables
+# -------------------------------------------------------------------
 
-from sqlmodel import SQLModel, Field
+class PaperAuthor(SQLModel, table=True):
+    paper_id: str = Field(foreign_key="paper.id", primary_key=True)
+    author_id: int = Field(foreign_key="author.id", primary_key=True)
+
+
+class PaperTag(SQLModel, table=True):
+    paper_id: str = Field(foreign_key="paper.id", primary_key=True)
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True)
+
+
+class PaperProject(SQLModel, table=True):
+    paper_id: str = Field(foreign_key="paper.id", primary_key=True)
+    project_id: int = Field(foreign_key="project.id", primary_key=True)
 
 
 # -------------------------------------------------------------------
@@ -27,22 +42,31 @@ class Paper(SQLModel, table=True):
     doi: Optional[str] = None
     arxiv_id: Optional[str] = None
 
+    # Persisted dedup keys (see dedup/normalize.py)
+    title_normalized: str = Field(default="", index=True)
+    title_fingerprint: Optional[str] = Field(default=None, index=True)
+    doi_normalized: Optional[str] = Field(default=None, index=True)
+
+    # SHA-256 of the ingested PDF (content address for thumbnails)
+    file_sha256: Optional[str] = Field(default=None, index=True)
+
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
 
     # Relationships
     authors: List["Author"] = Relationship(
         back_populates="papers",
-        link_model="PaperAuthor",
+        link_model=PaperAuthor,
     )
 
     tags: List["Tag"] = Relationship(
         back_populates="papers",
-        link_model="PaperTag",
+        link_model=PaperTag,
     )
 
     projects: List["Project"] = Relationship(
         back_populates="papers",
-        link_model="PaperProject",
+        link_model=PaperProject,
     )
 
     notes: List["Note"] = Relationship(back_populates="paper")
@@ -56,7 +80,7 @@ class Author(SQLModel, table=True):
 
     papers: List[Paper] = Relationship(
         back_populates="authors",
-        link_model="PaperAuthor",
+        link_model=PaperAuthor,
     )
 
 
@@ -66,7 +90,7 @@ class Tag(SQLModel, table=True):
 
     papers: List[Paper] = Relationship(
         back_populates="tags",
-        link_model="PaperTag",
+        link_model=PaperTag,
     )
 
 
@@ -78,7 +102,7 @@ class Project(SQLModel, table=True):
 
     papers: List[Paper] = Relationship(
         back_populates="projects",
-        link_model="PaperProject",
+        link_model=PaperProject,
     )
 
 
@@ -89,3 +113,150 @@ class Note(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
     paper: Optional[Paper] = Relationship(back_populates="notes")
+
+
+# -------------------------------------------------------------------
+# Deduplication index
+# -------------------------------------------------------------------
+
+class DedupCandidate(SQLModel, table=True):
+    """
+    Persisted candidate duplicate pair.
+
+    Pairs are stored once, with paper_1_id < paper_2_id.
+    """
+
+    paper_1_id: str = Field(foreign_key="paper.id", primary_key=True)
+    paper_2_id: str = Field(foreign_key="paper.id", primary_key=True, index=True)
+    score: float = Field(index=True)
+    scored_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class DedupState(SQLModel, table=True):
+    """
+    Single-row state of the incremental dedup index.
+
+    - processed_seq: last ChangeLog.seq folded into the candidates
+    - candidates_seq: processed_seq when the candidates last changed
+    - min_score: lowest score persisted in DedupCandidate
+    - clusters_*: inputs of the persisted DedupCluster rows
+    """
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    processed_seq: Optional[int] = None
+    candidates_seq: Optional[int] = None
+    min_score: float = 0.5
+
+    # Index state the persisted clusters were built from
+    clusters_threshold: Optional[float] = None
+    clusters_built_seq: Optional[int] = None
+
+
+class DedupCluster(SQLModel, table=True):
+    """
+    Group of papers connected by candidate pairs (union-find).
+    """
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    representative_id: str = Field(foreign_key="paper.id")
+    size: int = Field(index=True)
+
+
+class DedupClusterMember(SQLModel, table=True):
+    cluster_id: int = Field(foreign_key="dedupcluster.id", primary_key=True)
+    paper_id: str = Field(foreign_key="paper.id", primary_key=True, index=True)
+
+
+# -------------------------------------------------------------------
+# Export cache
+# -------------------------------------------------------------------
+
+class ExportFragment(SQLModel, table=True):
+    """
+    Rendered export entry for one paper in one format.
+
+    Valid while paper_updated_at matches Paper.updated_at.
+    """
+
+    paper_id: str = Field(foreign_key="paper.id", primary_key=True)
+    format: str = Field(primary_key=True)
+    paper_updated_at: str
+    body: str
+
+
+# -------------------------------------------------------------------
+# Facets
+# -------------------------------------------------------------------
+
+class FacetCount(SQLModel, table=True):
+    """
+    Materialized facet count (tag / year / venue -> number of papers).
+    """
+
+    facet: str = Field(primary_key=True)
+    value: str = Field(primary_key=True)
+    count: int = 0
+
+
+# -------------------------------------------------------------------
+# Related papers
+# -------------------------------------------------------------------
+
+class PaperNeighbor(SQLModel, table=True):
+    """
+    Precomputed related paper (top-k list per paper, see related.py).
+    """
+
+    paper_id: str = Field(foreign_key="paper.id", primary_key=True)
+    neighbor_id: str = Field(foreign_key="paper.id", primary_key=True)
+    score: float
+
+
+class RelatedState(SQLModel, table=True):
+    """
+    Single-row state of the neighbor lists.
+
+    - processed_seq: last ChangeLog.seq folded into the lists
+    """
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    processed_seq: Optional[int] = None
+
+
+# -------------------------------------------------------------------
+# Semantic index
+# -------------------------------------------------------------------
+
+class VectorState(SQLModel, table=True):
+    """
+    Single-row state of the vector store (see semantic.py).
+
+    - processed_seq: last ChangeLog.seq embedded
+    - token: also written to the store's meta file on every update;
+      a mismatch (e.g. after a restore) forces a rebuild
+    """
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    processed_seq: Optional[int] = None
+    token: Optional[str] = None
+
+
+# -------------------------------------------------------------------
+# Change feed
+# -------------------------------------------------------------------
+
+class ChangeLog(SQLModel, table=True):
+    """
+    Append-only change feed (see changes.py); `seq` orders all writes.
+
+    - entity / entity_id: "paper" or "project" and its id
+    - op: create / tag / note / add_paper / merge
+    - data: compact JSON delta
+    """
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    at: datetime = Field(default_factory=datetime.utcnow)
+    entity: str
+    entity_id: str
+    op: str = Field(index=True)
+    data: str = "{}"
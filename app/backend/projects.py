@@ -4,6 +4,7 @@ from sqlmodel import select
 
 from app.backend.db import get_session
 from app.backend.models import Project, Paper, PaperProject
+from app.backend.changes import change, record_changes
 
 
 # -------------------------------------------------------------------
@@ -30,6 +31,19 @@ def create_project(name: str, description: str = "") -> Project:
             description=description or "",
         )
         session.add(project)
+        session.flush()
+        record_changes(
+            session.connection(),
+            [
+                change(
+                    "project",
+                    project.id,
+                    "create",
+                    name=name,
+                    description=project.description,
+                )
+            ],
+        )
         session.commit()
         session.refresh(project)
         return project
@@ -73,6 +87,10 @@ def add_paper_to_project(project_id: int, paper_id: str) -> None:
                     paper_id=paper_id,
                 )
             )
+            record_changes(
+                session.connection(),
+                [change("project", project_id, "add_paper", paper_id=paper_id)],
+            )
             session.commit()
 
 
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, select, text
+
+from app.backend.changes import changed_papers
+from app.backend.db import chunked, engine, get_session
+from app.backend.models import Paper, RelatedState
+
+
+# -------------------------------------------------------------------
+# Scoring
+# -------------------------------------------------------------------
+
+# Neighbors kept per paper
+RELATED_K = 20
+
+# Weight of one shared feature, divided by log2(1 + papers sharing it)
+WEIGHTS = {
+    "author": 3.0,
+    "project": 1.5,
+    "tag": 1.0,
+    "title": 0.5,
+}
+
+# Features shared by more papers than this carry no signal and are skipped
+MAX_GROUP = 1000
+
+# Changes that alter a paper's authors, tags, projects or title
+RELATED_OPS = ("create", "tag", "add_paper", "merge")
+
+# Link tables: kind -> (table, other key column)
+LINKS = {
+    "author": ("paperauthor", "author_id"),
+    "tag": ("papertag", "tag_id"),
+    "project": ("paperproject", "project_id"),
+}
+
+_TOKEN_RE = re.compile(r"\w{3,}", re.UNICODE)
+
+_STOPWORDS = frozenset(
+    "and are for from into its new not off one our over the their this two "
+    "using via with without based toward towards".split()
+)
+
+Feature = Tuple[str, object]
+
+
+def _in(sql: str, name: str = "ids"):
+    return text(sql).bindparams(bindparam(name, expanding=True))
+
+
+def _link_features(
+    conn: Connection,
+    ids: List[str],
+    groups: Dict[Feature, Optional[List[str]]],
+    features: Dict[str, List[Feature]],
+) -> None:
+    """
+    Authors / tags / projects of `ids`; fills `groups` with their members.
+    """
+    for kind, (table, key) in LINKS.items():
+        values = set()
+        rows = conn.execute(
+            _in(f"SELECT paper_id, {key} FROM {table} WHERE paper_id IN :ids"),
+            {"ids": ids},
+        )
+        for pid, value in rows:
+            features[pid].append((kind, value))
+            values.add(value)
+
+        missing = [v for v in values if (kind, v) not in groups]
+        for chunk in chunked(missing):
+            sizes = dict(
+                conn.execute(
+                    _in(
+                        f"SELECT {key}, COUNT(*) FROM {table} "
+                        f"WHERE {key} IN :ids GROUP BY {key}"
+                    ),
+                    {"ids": chunk},
+                ).all()
+            )
+            small = [v for v in chunk if sizes.get(v, 0) <= MAX_GROUP]
+            for v in chunk:
+                groups[(kind, v)] = [] if v in small else None
+            if not small:
+                continue
+
+            rows = conn.execute(
+                _in(f"SELECT {key}, paper_id FROM {table} WHERE {key} IN :ids"),
+                {"ids": small},
+            )
+            for value, pid in rows:
+                groups[(kind, value)].append(pid)
+
+
+def _title_features(
+    conn: Connection,
+    ids: List[str],
+    groups: Dict[Feature, Optional[List[str]]],
+    features: Dict[str, List[Feature]],
+) -> None:
+    """
+    Title terms of `ids`; members are looked up in paper_fts.
+    """
+    rows = conn.execute(_in("SELECT id, title FROM paper WHERE id IN :ids"), {"ids": ids})
+    for pid, title in rows.all():
+        for token in set(_TOKEN_RE.findall((title or "").lower())) - _STOPWORDS:
+            feature = ("title", token)
+            features[pid].append(feature)
+            if feature in groups:
+                continue
+
+            members = [
+                r[0]
+                for r in conn.execute(
+                    text(
+                        """
+                        SELECT p.id
+                        FROM paper_fts
+                        JOIN paper p ON p.rowid = paper_fts.rowid
+                        WHERE paper_fts MATCH :q
+                        LIMIT :cap;
+                        """
+                    ),
+                    {"q": f'title : "{token}"', "cap": MAX_GROUP + 1},
+                )
+            ]
+            groups[feature] = members if len(members) <= MAX_GROUP else None
+
+
+def _neighbors(
+    pid: str,
+    features: List[Feature],
+    groups: Dict[Feature, Optional[List[str]]],
+    k: int,
+) -> List[Tuple[str, float]]:
+    scores: Counter = Counter()
+    for feature in features:
+        members = groups.get(feature)
+        if not members or len(members) < 2:
+            continue
+        weight = WEIGHTS[feature[0]] / math.log2(1 + len(members))
+        for other in members:
+            if other != pid:
+                scores[other] += weight
+    return [(other, round(score, 4)) for other, score in scores.most_common(k)]
+
+
+# -------------------------------------------------------------------
+# Neighbor lists
+# -------------------------------------------------------------------
+
+_UPSERT_SQL = text(
+    """
+    INSERT INTO paperneighbor(paper_id, neighbor_id, score)
+    VALUES (:paper_id, :neighbor_id, :score)
+    ON CONFLICT(paper_id, neighbor_id) DO UPDATE SET score = excluded.score;
+    """
+)
+
+_TRIM_SQL = _in(
+    """
+    DELETE FROM paperneighbor
+    WHERE rowid IN (
+        SELECT rowid FROM (
+            SELECT rowid, ROW_NUMBER() OVER (
+                PARTITION BY paper_id ORDER BY score DESC
+            ) AS rn
+            FROM paperneighbor
+            WHERE paper_id IN :ids
+        )
+        WHERE rn > :k
+    );
+    """
+)
+
+
+def _get_state(session: Session) -> RelatedState:
+    state = session.get(RelatedState, 1)
+    if state is None:
+        state = RelatedState(id=1, processed_seq=None)
+        session.add(state)
+    return state
+
+
+def update_related_index(full: bool = False, k: int = RELATED_K) -> Dict:
+    """
+    Recompute neighbor lists of papers created, tagged, added to a project
+    or merged into since the changelog seq kept in `relatedstate`.
+
+    Each refreshed paper also offers itself to its neighbors' lists,
+    which are trimmed back to `k`. `full` recomputes every list.
+    """
+    with get_session() as session:
+        state = _get_state(session)
+        conn = session.connection()
+
+        changed, upto = changed_papers(
+            conn, None if full else state.processed_seq, RELATED_OPS
+        )
+        full = changed is None
+
+        if full:
+            conn.execute(text("DELETE FROM paperneighbor;"))
+            delta = list(session.exec(select(Paper.id)).all())
+        else:
+            # Papers merged away since are gone
+            delta = []
+            for chunk in chunked(sorted(changed)):
+                delta.extend(session.exec(select(Paper.id).where(Paper.id.in_(chunk))))
+
+        if not delta:
+            if state.processed_seq != upto:
+                state.processed_seq = upto
+                session.add(state)
+                session.commit()
+            return {"refreshed": 0, "neighbors_updated": 0}
+
+        groups: Dict[Feature, Optional[List[str]]] = {}
+        touched = set()
+
+        for chunk in chunked(delta):
+            if not full:
+                conn.execute(
+                    _in("DELETE FROM paperneighbor WHERE paper_id IN :ids"),
+                    {"ids": chunk},
+                )
+
+            features: Dict[str, List[Feature]] = defaultdict(list)
+            _link_features(conn, chunk, groups, features)
+            _title_features(conn, chunk, groups, features)
+
+            params = []
+            for pid in chunk:
+                for other, score in _neighbors(pid, features[pid], groups, k):
+                    params.append({"paper_id": pid, "neighbor_id": other, "score": score})
+                    if not full:
+                        params.append({"paper_id": other, "neighbor_id": pid, "score": score})
+                        touched.add(other)
+            if params:
+                conn.execute(_UPSERT_SQL, params)
+
+        for chunk in chunked(sorted(touched)):
+            conn.execute(_TRIM_SQL, {"ids": chunk, "k": k})
+
+        state.processed_seq = upto
+        session.add(state)
+        session.commit()
+
+    return {"refreshed": len(delta), "neighbors_updated": len(touched)}
+
+
+# -------------------------------------------------------------------
+# Lookup
+# -------------------------------------------------------------------
+
+def related_papers(paper_id: str, limit: int = 10) -> List[dict]:
+    """
+    Papers related to `paper_id` (shared authors, projects, tags, title terms).
+
+    Read-only: served from the precomputed lists, which are refreshed
+    after ingest and import and by maintenance.
+    """
+    with engine.connect() as conn:
+        exists = conn.execute(text("SELECT 1 FROM paper WHERE id = :id"), {"id": paper_id})
+        if exists.first() is None:
+            raise ValueError("Paper not found")
+
+        rows = conn.execute(
+            text(
+                """
+                SELECT p.id, p.title, p.doi, p.year, p.venue, n.score
+                FROM paperneighbor n
+                JOIN paper p ON p.id = n.neighbor_id
+                WHERE n.paper_id = :id
+                ORDER BY n.score DESC
+                LIMIT :limit;
+                """
+            ),
+            {"id": paper_id, "limit": limit},
+        ).mappings().all()
+
+    return [dict(r) for r in rows]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.exc import OperationalError
 from sqlmodel import text
 
 from app.backend.db import engine
@@ -10,6 +11,17 @@ from app.backend.db import engine
 # Full-text search (FTS5)
 # -------------------------------------------------------------------
 
+# sqlite3 messages for a MATCH expression FTS5 cannot parse
+_QUERY_ERRORS = ("fts5:", "unterminated string", "no such column", "unknown special query")
+
+
+def is_query_error(e: OperationalError) -> bool:
+    """
+    True if `e` reports a malformed FTS query (not a lock or I/O error).
+    """
+    return str(e.orig).startswith(_QUERY_ERRORS)
+
+
 def fts_search(query: str, limit: int = 50) -> List[dict]:
     """
     Full-text search across title / abstract / DOI using SQLite FTS5.
@@ -24,7 +36,7 @@ def fts_search(query: str, limit: int = 50) -> List[dict]:
             p.venue,
             bm25(paper_fts) AS rank
         FROM paper_fts
-        JOIN paper p ON p.id = paper_fts.paper_id
+        JOIN paper p ON p.rowid = paper_fts.rowid
         WHERE paper_fts MATCH :q
         ORDER BY rank
         LIMIT :limit;
@@ -40,6 +52,68 @@ def fts_search(query: str, limit: int = 50) -> List[dict]:
     return [dict(r) for r in rows]
 
 
+def combined_search(query: str, limit: int = 50, note_weight: float = 0.5) -> List[dict]:
+    """
+    Rank papers by bm25 over paper_fts and their notes (note_fts).
+
+    rank = paper bm25 + note_weight * best note bm25 (lower is better);
+    a paper matching only through its note is included.
+    """
+    sql = text(
+        """
+        WITH paper_hits AS (
+            SELECT p.id AS paper_id, h.rank AS paper_rank, NULL AS note_rank
+            FROM (
+                SELECT rowid, bm25(paper_fts) AS rank
+                FROM paper_fts
+                WHERE paper_fts MATCH :q
+                LIMIT -1  -- keeps bm25() out of the outer aggregate
+            ) h
+            JOIN paper p ON p.rowid = h.rowid
+        ),
+        note_hits AS (
+            SELECT n.paper_id, NULL AS paper_rank, MIN(h.rank) AS note_rank
+            FROM (
+                SELECT rowid, bm25(note_fts) AS rank
+                FROM note_fts
+                WHERE note_fts MATCH :q
+                LIMIT -1
+            ) h
+            JOIN note n ON n.id = h.rowid
+            GROUP BY n.paper_id
+        ),
+        hits AS (
+            SELECT * FROM paper_hits
+            UNION ALL
+            SELECT * FROM note_hits
+        )
+        SELECT
+            p.id,
+            p.title,
+            p.doi,
+            p.year,
+            p.venue,
+            COALESCE(MIN(hits.paper_rank), 0)
+                + :note_weight * COALESCE(MIN(hits.note_rank), 0) AS rank,
+            MIN(hits.paper_rank) IS NOT NULL AS paper_hit,
+            MIN(hits.note_rank) IS NOT NULL AS note_hit
+        FROM hits
+        JOIN paper p ON p.id = hits.paper_id
+        GROUP BY p.id
+        ORDER BY rank
+        LIMIT :limit;
+        """
+    )
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            sql,
+            {"q": query, "limit": limit, "note_weight": note_weight},
+        ).mappings().all()
+
+    return [dict(r) for r in rows]
+
+
 # -------------------------------------------------------------------
 # Paper listing (metadata)
 # -------------------------------------------------------------------
@@ -84,3 +158,53 @@ def list_papers(
         ).mappings().all()
 
     return [dict(r) for r in rows]
+
+
+# -------------------------------------------------------------------
+# Paper filters (SQL pushdown)
+# -------------------------------------------------------------------
+
+def paper_filter_sql(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+    alias: str = "p",
+) -> Tuple[str, str, Dict]:
+    """
+    Build JOIN / WHERE clauses restricting `paper AS <alias>` rows.
+
+    Returns (joins, where, params); `where` is empty when no filter is set.
+    """
+    joins: List[str] = []
+    conditions: List[str] = []
+    params: Dict = {}
+
+    if project_id is not None:
+        joins.append(
+            f"JOIN paperproject f_pp ON f_pp.paper_id = {alias}.id "
+            "AND f_pp.project_id = :f_project_id"
+        )
+        params["f_project_id"] = project_id
+
+    if tag:
+        joins.append(f"JOIN papertag f_pt ON f_pt.paper_id = {alias}.id")
+        joins.append("JOIN tag f_t ON f_t.id = f_pt.tag_id AND f_t.name = :f_tag")
+        params["f_tag"] = tag.strip().lower()
+
+    if query:
+        joins.append(f"JOIN paper_fts ON paper_fts.rowid = {alias}.rowid")
+        conditions.append("paper_fts MATCH :f_query")
+        params["f_query"] = query
+
+    if year_from is not None:
+        conditions.append(f"{alias}.year >= :f_year_from")
+        params["f_year_from"] = year_from
+
+    if year_to is not None:
+        conditions.append(f"{alias}.year <= :f_year_to")
+        params["f_year_to"] = year_to
+
+    where = "WHERE " + " AND ".join(conditions) if conditions else ""
+    return "\n".join(joins), where, params
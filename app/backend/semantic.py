@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from uuid import uuid4
+
+from sqlalchemy import bindparam
+from sqlalchemy.engine import Connection
+from sqlmodel import text
+
+from app.backend.changes import changed_papers
+from app.backend.db import chunked, current_library, engine, library_dir
+from app.backend.search import fts_search
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install "research-library-engine[semantic]"
+    np = None
+
+
+# -------------------------------------------------------------------
+# Vector store layout
+# -------------------------------------------------------------------
+
+# float32 matrix, one row per paper (row index = paper.rowid), memory-mapped,
+# stored per library under <library dir>/vectors/
+VECTORS_FILE = "paper.f32"
+META_FILE = "paper.meta.json"
+DF_FILE = "paper.df.npy"
+PRESENT_FILE = "paper.present.npy"
+
+# Hashed feature space: 4 KiB per paper
+DIM = 1024
+
+# Rows per matrix-vector product when scoring
+SCORE_BATCH = 65536
+
+# Changes that alter a paper's title or abstract (merged duplicates are
+# cleared by the paper count check)
+VECTOR_OPS = ("create",)
+
+_TOKEN_RE = re.compile(r"\w{2,}", re.UNICODE)
+
+# Guards index updates (the server runs queries on a thread pool)
+_lock = threading.Lock()
+
+
+def _store(filename: str) -> Path:
+    return library_dir(current_library()) / "vectors" / filename
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Semantic search needs numpy (pip install numpy)")
+
+
+# -------------------------------------------------------------------
+# Embedding (hashed TF-IDF)
+# -------------------------------------------------------------------
+
+def embed_text(content: str) -> "np.ndarray":
+    """
+    Hashed sublinear term frequencies, L2-normalized.
+
+    IDF is applied on the query side only, so stored vectors stay valid
+    as document frequencies change.
+    """
+    vec = np.zeros(DIM, dtype=np.float32)
+    for token, n in Counter(_TOKEN_RE.findall(content.lower())).items():
+        vec[zlib.crc32(token.encode("utf-8")) % DIM] += 1.0 + math.log(n)
+
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def _query_vector(query: str, state: Dict) -> Optional["np.ndarray"]:
+    docs = state["meta"]["docs"]
+    idf = np.log((1.0 + docs) / (1.0 + state["df"])) + 1.0
+
+    # (q * idf) . (d * idf), with d stored without idf
+    q = embed_text(query) * (idf * idf).astype(np.float32)
+    norm = float(np.linalg.norm(q))
+    return q / norm if norm else None
+
+
+# -------------------------------------------------------------------
+# Index maintenance
+# -------------------------------------------------------------------
+
+def _empty_state() -> Dict:
+    return {
+        "meta": {"dim": DIM, "rows": 0, "docs": 0, "token": None},
+        "df": np.zeros(DIM, dtype=np.int64),
+        "present": np.zeros(0, dtype=bool),
+    }
+
+
+def _load_state() -> Dict:
+    if _store(META_FILE).exists() and _store(VECTORS_FILE).exists():
+        meta = json.loads(_store(META_FILE).read_text(encoding="utf-8"))
+        if meta.get("dim") == DIM:
+            return {
+                "meta": meta,
+                "df": np.load(_store(DF_FILE)),
+                "present": np.load(_store(PRESENT_FILE)),
+            }
+    return _empty_state()
+
+
+def _save_state(state: Dict) -> None:
+    np.save(_store(DF_FILE), state["df"])
+    np.save(_store(PRESENT_FILE), state["present"])
+    _store(META_FILE).write_text(json.dumps(state["meta"]), encoding="utf-8")
+
+
+def _open_vectors(rows: int, mode: str) -> Optional["np.memmap"]:
+    if rows == 0:
+        return None
+    return np.memmap(_store(VECTORS_FILE), dtype=np.float32, mode=mode, shape=(rows, DIM))
+
+
+def _grow(state: Dict, min_rows: int) -> None:
+    """
+    Extend the vector file (zero-filled) to hold at least `min_rows` rows.
+    """
+    rows = state["meta"]["rows"]
+    if min_rows <= rows:
+        return
+
+    new_rows = max(min_rows, rows + rows // 2, 1024)
+    with _store(VECTORS_FILE).open("a+b") as f:
+        f.truncate(new_rows * DIM * 4)
+
+    state["present"] = np.concatenate(
+        [state["present"], np.zeros(new_rows - rows, dtype=bool)]
+    )
+    state["meta"]["rows"] = new_rows
+
+
+def _drop_deleted(conn: Connection, state: Dict, vectors: "np.memmap") -> int:
+    present = state["present"]
+    live = np.zeros(len(present), dtype=bool)
+    rowids = [r[0] for r in conn.execute(text("SELECT rowid FROM paper"))]
+    live[[r for r in rowids if r < len(present)]] = True
+
+    stale = np.flatnonzero(present & ~live)
+    for rowid in stale:
+        state["df"] -= vectors[rowid] > 0
+        vectors[rowid] = 0.0
+    present[stale] = False
+    return len(stale)
+
+
+_UPSERT_STATE_SQL = text(
+    """
+    INSERT INTO vectorstate(id, processed_seq, token)
+    VALUES (1, :seq, :token)
+    ON CONFLICT(id) DO UPDATE SET
+        processed_seq = excluded.processed_seq,
+        token = excluded.token;
+    """
+)
+
+
+def update_vector_index(rebuild: bool = False) -> Dict:
+    """
+    Embed new or modified papers (title + abstract) into the vector store.
+
+    Incremental like the dedup index: only papers created since the
+    changelog seq kept in `vectorstate` are embedded; rows of deleted
+    papers are cleared when the paper count no longer matches.
+
+    The store files and `vectorstate` share a token renewed on every
+    write; when they disagree (a restored or replaced database, an
+    interrupted update) the store is rebuilt from scratch.
+    """
+    _require_numpy()
+
+    with _lock, engine.connect() as conn:
+        row = conn.execute(
+            text("SELECT processed_seq, token FROM vectorstate WHERE id = 1")
+        ).first()
+        since, token = row if row else (None, None)
+
+        _store(VECTORS_FILE).parent.mkdir(parents=True, exist_ok=True)
+        state = _load_state()
+        reset = rebuild or token is None or state["meta"].get("token") != token
+        if reset:
+            _store(VECTORS_FILE).unlink(missing_ok=True)
+            state = _empty_state()
+            since = None
+        meta = state["meta"]
+
+        changed, upto = changed_papers(conn, since, VECTOR_OPS)
+        sql = "SELECT rowid, title, abstract FROM paper"
+        if changed is None:
+            delta = conn.execute(text(sql)).all()
+        else:
+            stmt = text(sql + " WHERE id IN :ids").bindparams(
+                bindparam("ids", expanding=True)
+            )
+            delta = []
+            for chunk in chunked(sorted(changed)):
+                delta.extend(conn.execute(stmt, {"ids": chunk}))
+
+        if delta:
+            _grow(state, max(r[0] for r in delta) + 1)
+
+        vectors = _open_vectors(meta["rows"], "r+")
+        present = state["present"]
+
+        for chunk in chunked(delta, 1000):
+            for rowid, title, abstract in chunk:
+                if present[rowid]:
+                    state["df"] -= vectors[rowid] > 0
+                vec = embed_text(f"{title} {abstract or ''}")
+                vectors[rowid] = vec
+                state["df"] += vec > 0
+                present[rowid] = True
+
+        removed = 0
+        total = conn.execute(text("SELECT COUNT(*) FROM paper")).scalar() or 0
+        if vectors is not None and int(present.sum()) != total:
+            removed = _drop_deleted(conn, state, vectors)
+
+        if vectors is not None:
+            vectors.flush()
+
+        if delta or removed or reset:
+            meta["docs"] = int(state["present"].sum())
+            meta["token"] = uuid4().hex
+
+            # Files first: if the commit is lost, the token mismatch rebuilds
+            _save_state(state)
+            conn.execute(_UPSERT_STATE_SQL, {"seq": upto, "token": meta["token"]})
+            conn.commit()
+        elif upto != since:
+            # Only unrelated changes: move the mark, the store is unchanged
+            conn.execute(_UPSERT_STATE_SQL, {"seq": upto, "token": token})
+            conn.commit()
+
+    return {"embedded": len(delta), "removed": removed, "papers": meta["docs"]}
+
+
+def refresh_vector_index() -> Optional[Dict]:
+    """
+    Incremental update after writes (ingest, import, maintenance).
+
+    Returns None without numpy: semantic search is optional.
+    """
+    if np is None:
+        return None
+    return update_vector_index()
+
+
+# -------------------------------------------------------------------
+# Queries
+# -------------------------------------------------------------------
+
+def _vector_scores(query: str) -> Optional["np.ndarray"]:
+    """
+    Scores of every row of the store against the query (0 for empty rows).
+
+    Read-only: the store is refreshed after ingest/import and by the
+    maintenance scheduler. A store not built yet, or not matching the
+    database (e.g. after a restore), gives None until then.
+    """
+    _require_numpy()
+    with engine.connect() as conn:
+        token = conn.execute(text("SELECT token FROM vectorstate WHERE id = 1")).scalar()
+    with _lock:
+        state = _load_state()
+    if token is None or state["meta"].get("token") != token:
+        return None
+
+    rows = state["meta"]["rows"]
+    q = _query_vector(query, state)
+    if rows == 0 or q is None:
+        return None
+
+    vectors = _open_vectors(rows, "r")
+    scores = np.empty(rows, dtype=np.float32)
+    for start in range(0, rows, SCORE_BATCH):
+        scores[start:start + SCORE_BATCH] = vectors[start:start + SCORE_BATCH] @ q
+    return scores
+
+
+def _top_rows(scores: "np.ndarray", k: int) -> List[int]:
+    k = min(k, len(scores))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [int(r) for r in top if scores[r] > 0]
+
+
+def _papers(conn: Connection, column: str, keys: Sequence) -> Dict:
+    """
+    Paper rows keyed by `rowid` or `id`.
+    """
+    stmt = text(
+        f"""
+        SELECT rowid AS rowid_, id, title, doi, year, venue
+        FROM paper
+        WHERE {column} IN :keys;
+        """
+    ).bindparams(bindparam("keys", expanding=True))
+
+    key = "rowid_" if column == "rowid" else "id"
+    found: Dict = {}
+    for chunk in chunked(list(keys)):
+        for r in conn.execute(stmt, {"keys": chunk}).mappings():
+            found[r[key]] = dict(r)
+    return found
+
+
+def semantic_search(query: str, limit: int = 50) -> List[dict]:
+    """
+    k-NN over title + abstract vectors (hashed TF-IDF, dot product).
+    """
+    scores = _vector_scores(query)
+    if scores is None:
+        return []
+
+    top = _top_rows(scores, limit)
+    with engine.connect() as conn:
+        papers = _papers(conn, "rowid", top)
+
+    results = []
+    for rowid in top:
+        paper = papers.get(rowid)
+        if paper is None:
+            continue
+        paper.pop("rowid_")
+        results.append({**paper, "score": round(float(scores[rowid]), 4)})
+    return results
+
+
+def hybrid_search(query: str, limit: int = 50, alpha: float = 0.5) -> List[dict]:
+    """
+    Blend bm25 (paper_fts) and vector scores.
+
+    Candidates are the top bm25 hits (any query term) plus the nearest
+    vectors; both scores are scaled to [0, 1] over the candidates and
+    combined as alpha * bm25 + (1 - alpha) * vector (higher is better).
+    """
+    if alpha < 0.0 or alpha > 1.0:
+        raise ValueError("alpha must be between 0 and 1")
+
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return []
+
+    pool = max(limit * 4, 50)
+    lexical = fts_search(" OR ".join(f'"{t}"' for t in tokens), pool)
+    scores = _vector_scores(query)
+
+    with engine.connect() as conn:
+        candidates = _papers(conn, "id", [r["id"] for r in lexical])
+        if scores is not None:
+            by_rowid = _papers(conn, "rowid", _top_rows(scores, pool))
+            for paper in by_rowid.values():
+                candidates.setdefault(paper["id"], paper)
+
+    # bm25 is negative (lower is better): use its magnitude as strength
+    strength = {r["id"]: -r["rank"] for r in lexical}
+    vector = {
+        pid: float(scores[p["rowid_"]]) if scores is not None else 0.0
+        for pid, p in candidates.items()
+    }
+    max_lex = max(strength.values(), default=0.0) or 1.0
+    max_vec = max(vector.values(), default=0.0) or 1.0
+
+    results = []
+    for pid, paper in candidates.items():
+        lex = strength.get(pid, 0.0) / max_lex
+        vec = max(vector[pid], 0.0) / max_vec
+        paper.pop("rowid_")
+        results.append(
+            {
+                **paper,
+                "score": round(alpha * lex + (1 - alpha) * vec, 4),
+                "bm25": round(lex, 4),
+                "vector": round(vec, 4),
+            }
+        )
+
+    results.sort(key=lambda r: r["score"], reverse=True)
+    return results[:limit]
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import text
+
+from app.backend.changes import latest_seq
+from app.backend.db import current_library, engine
+from app.backend.dedup.normalize import normalize_doi
+
+
+# Title matches considered per prefix (newest first). Ranking every match
+# (bm25 reads the whole doclist of a prefix) costs tens of ms on a large
+# library; reading a capped slice off a prefix index stays under one.
+SUGGEST_CANDIDATES = 500
+
+# Prefix lengths with an FTS prefix index (paper_fts prefix='2 3 4'); other
+# prefixes would merge the doclists of every term they start
+MIN_TITLE_PREFIX = 2
+MAX_TITLE_PREFIX = 4
+
+# Changes that add or remove titles, authors or tags
+SUGGEST_OPS = ("create", "merge", "tag")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Upper bound for "starts with" range scans on indexed text columns
+_RANGE_END = "\U0010ffff"
+
+
+def _title_match(prefix: str) -> Tuple[str, Optional[str]]:
+    """
+    FTS5 query: every token must match in the title, the last one as a prefix.
+
+    The last token is matched on a prefix index: cut to MAX_TITLE_PREFIX,
+    or left out below MIN_TITLE_PREFIX. In both cases it is also returned,
+    to be checked on the candidates.
+    """
+    tokens = _TOKEN_RE.findall(prefix.lower())
+    if not tokens:
+        return "", None
+
+    last = tokens[-1]
+    terms = [f'title : "{t}"' for t in tokens[:-1]]
+    if len(last) >= MIN_TITLE_PREFIX:
+        terms.append(f'title : "{last[:MAX_TITLE_PREFIX]}"*')
+    check = None if MIN_TITLE_PREFIX <= len(last) <= MAX_TITLE_PREFIX else last
+    return " AND ".join(terms), check
+
+
+def _starts_word(title: str, prefix: str) -> bool:
+    return any(t.startswith(prefix) for t in _TOKEN_RE.findall(title.lower()))
+
+
+def _suggest(prefix: str, limit: int) -> Dict[str, List[Dict]]:
+    result: Dict[str, List[Dict]] = {"titles": [], "authors": [], "tags": []}
+    lo = prefix.lower()
+    hi = lo + _RANGE_END
+
+    with engine.connect() as conn:
+        if lo.startswith("10."):
+            # DOI prefix: range scan on the normalized DOI index
+            doi = normalize_doi(prefix) or lo
+            rows = conn.execute(
+                text(
+                    """
+                    SELECT id, title, doi FROM paper
+                    WHERE doi_normalized >= :lo AND doi_normalized < :hi
+                    ORDER BY doi_normalized
+                    LIMIT :limit;
+                    """
+                ),
+                {"lo": doi, "hi": doi + _RANGE_END, "limit": limit},
+            ).mappings().all()
+            result["titles"] = [dict(r) for r in rows]
+        else:
+            match, check = _title_match(prefix)
+            if match:
+                rows = conn.execute(
+                    text(
+                        """
+                        SELECT p.id, p.title, p.doi
+                        FROM (
+                            SELECT rowid
+                            FROM paper_fts
+                            WHERE paper_fts MATCH :q
+                            ORDER BY rowid DESC
+                            LIMIT :candidates
+                        ) h
+                        JOIN paper p ON p.rowid = h.rowid;
+                        """
+                    ),
+                    {"q": match, "candidates": SUGGEST_CANDIDATES},
+                ).mappings().all()
+                if check:
+                    rows = [r for r in rows if _starts_word(r["title"], check)]
+
+                # Every candidate matches the same terms, so bm25 would mostly
+                # prefer short titles: rank by length (newest first on ties)
+                rows = sorted(rows, key=lambda r: len(r["title"] or ""))[:limit]
+                result["titles"] = [dict(r) for r in rows]
+
+        rows = conn.execute(
+            text(
+                """
+                SELECT id, name FROM author
+                WHERE lower(name) >= :lo AND lower(name) < :hi
+                ORDER BY lower(name)
+                LIMIT :limit;
+                """
+            ),
+            {"lo": lo, "hi": hi, "limit": limit},
+        ).mappings().all()
+        result["authors"] = [dict(r) for r in rows]
+
+        rows = conn.execute(
+            text(
+                """
+                SELECT name FROM tag
+                WHERE name >= :lo AND name < :hi
+                ORDER BY name
+                LIMIT :limit;
+                """
+            ),
+            {"lo": lo, "hi": hi, "limit": limit},
+        ).all()
+        result["tags"] = [r[0] for r in rows]
+
+    return result
+
+
+@lru_cache(maxsize=2048)
+def _suggest_cached(
+    library: str,
+    prefix: str,
+    limit: int,
+    version: int,
+) -> Dict[str, List[Dict]]:
+    return _suggest(prefix, limit)
+
+
+def suggest(prefix: str, limit: int = 8) -> Dict[str, List[Dict]]:
+    """
+    Typeahead suggestions (titles, authors, tags) for a prefix.
+
+    Titles use the paper_fts prefix indexes (or the DOI index for "10."),
+    shortest first among the SUGGEST_CANDIDATES newest matches (a single
+    letter alone suggests no titles); authors and tags use
+    indexed range scans. Results are kept in a small LRU keyed by the
+    newest change that can alter them (SUGGEST_OPS): notes and project
+    writes leave it warm, and writes by other processes are seen.
+    """
+    prefix = " ".join(prefix.split())
+    if not prefix:
+        return {"titles": [], "authors": [], "tags": []}
+
+    version = latest_seq(SUGGEST_OPS)
+    return _suggest_cached(current_library(), prefix, min(max(limit, 1), 50), version)
@@ -5,6 +5,9 @@ from sqlmodel import select
 
 from app.backend.db import get_session
 from app.backend.models import Paper, Tag, PaperTag, Note
+from app.backend.facets import bump_facets
+from app.backend.fts import index_note
+from app.backend.changes import change, record_changes
 
 
 # -------------------------------------------------------------------
@@ -44,6 +47,8 @@ def add_tag_to_paper(paper_id: str, tag_name: str) -> None:
             session.add(
                 PaperTag(paper_id=paper_id, tag_id=tag.id)
             )
+            bump_facets(session.connection(), {("tag", tag_name): 1})
+            record_changes(session.connection(), [change("paper", paper_id, "tag", tag=tag_name)])
             session.commit()
 
 
@@ -66,6 +71,7 @@ def list_tags_for_paper(paper_id: str):
 def set_note_for_paper(paper_id: str, markdown: str) -> None:
     """
     Create or update the Markdown note for a paper.
+    The notes FTS index is updated in the same transaction.
     """
     with get_session() as session:
         paper = session.get(Paper, paper_id)
@@ -87,6 +93,12 @@ def set_note_for_paper(paper_id: str, markdown: str) -> None:
             note.content_md = markdown
             note.updated_at = datetime.utcnow()
 
+        session.flush()
+        index_note(session.connection(), note.id, markdown)
+        record_changes(
+            session.connection(),
+            [change("paper", paper_id, "note", content_md=markdown)],
+        )
         session.commit()
 
 
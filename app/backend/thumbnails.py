@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+
+from app.backend.db import DATA_DIR
+
+
+# Thumbnails are content-addressed by the PDF's SHA-256:
+# data/thumbnails/<sha[:2]>/<sha>.png
+THUMB_DIR = DATA_DIR / "thumbnails"
+
+# Rendered width in pixels (height follows the page aspect ratio)
+THUMB_WIDTH = 240
+
+
+def thumbnail_path(sha256: str) -> Path:
+    return THUMB_DIR / sha256[:2] / f"{sha256}.png"
+
+
+# -------------------------------------------------------------------
+# Rendering
+# -------------------------------------------------------------------
+
+def render_thumbnail(pdf_path: Path, sha256: str, width: int = THUMB_WIDTH) -> bool:
+    """
+    Render the first page of a PDF to a PNG thumbnail.
+
+    Top-level (picklable) so it can run in a worker process.
+    Returns False if the PDF has no pages or cannot be rendered.
+    """
+    dest = thumbnail_path(sha256)
+    if dest.exists():
+        return True
+
+    try:
+        doc = fitz.open(str(pdf_path))
+        try:
+            if doc.page_count == 0:
+                return False
+            page = doc.load_page(0)
+            zoom = width / page.rect.width
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            data = pix.tobytes("png")
+        finally:
+            doc.close()
+    except Exception:
+        return False
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f"{dest.name}.{os.getpid()}.partial")
+    tmp.write_bytes(data)
+    os.replace(tmp, dest)
+    return True
+
+
+def render_thumbnails(
+    files: Sequence[Tuple[Path, str]],
+    workers: Optional[int] = None,
+) -> Dict[str, bool]:
+    """
+    Render thumbnails for (pdf_path, sha256) pairs on a process pool.
+
+    Files that already have a thumbnail (or repeat a hash) are skipped.
+    Returns {sha256: rendered}.
+    """
+    todo: Dict[str, Path] = {}
+    result: Dict[str, bool] = {}
+    for path, sha256 in files:
+        if sha256 in result or sha256 in todo:
+            continue
+        if thumbnail_path(sha256).exists():
+            result[sha256] = True
+        else:
+            todo[sha256] = path
+
+    if len(todo) <= 1:
+        for sha256, path in todo.items():
+            result[sha256] = render_thumbnail(path, sha256)
+        return result
+
+    # Rasterizing is CPU-bound and holds the GIL: use processes, not threads
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = list(todo)
+        paths = [todo[h] for h in hashes]
+        for sha256, ok in zip(hashes, pool.map(render_thumbnail, paths, hashes)):
+            result[sha256] = ok
+
+    return result
@@ -15,6 +15,13 @@ async function apiGet(path) {
   return res.json();
 }
 
+async function apiGetNdjson(path) {
+  const res = await fetch(API + path);
+  if (!res.ok) throw new Error(`GET ${path} -> ${res.status}`);
+  const text = await res.text();
+  return text.split("\n").filter(line => line.trim()).map(line => JSON.parse(line));
+}
+
 async function apiPost(path, body) {
   // send as query params for simple FastAPI function params
   const url = new URL(API + path, window.location.origin);
@@ -40,12 +47,14 @@ function renderPapersTable(rows) {
   for (const r of rows) {
     const tr = document.createElement("tr");
     tr.innerHTML = `
+      <td><img class="thumb" loading="lazy" alt="" src="${API}/papers/${encodeURIComponent(r.id)}/thumbnail" /></td>
       <td>${escapeHtml(r.title || "")}</td>
       <td>${escapeHtml(String(r.year || ""))}</td>
       <td>${escapeHtml(r.venue || "")}</td>
       <td>${escapeHtml(r.doi || "")}</td>
       <td><code>${escapeHtml(r.id || "")}</code></td>
     `;
+    tr.querySelector(".thumb").addEventListener("error", e => e.target.remove());
     tr.addEventListener("click", () => selectPaper(r.id, r.title));
     tbody.appendChild(tr);
   }
@@ -83,6 +92,38 @@ async function searchPapers() {
   }
 }
 
+let suggestTimer = null;
+
+function scheduleSuggest() {
+  clearTimeout(suggestTimer);
+  suggestTimer = setTimeout(loadSuggestions, 120);
+}
+
+async function loadSuggestions() {
+  const prefix = $("searchInput").value.trim();
+  const list = $("searchSuggestions");
+  if (prefix.length < 2) {
+    list.innerHTML = "";
+    return;
+  }
+  try {
+    const data = await apiGet(`/suggest?prefix=${encodeURIComponent(prefix)}&limit=8`);
+    const values = [
+      ...data.titles.map(t => t.title),
+      ...data.authors.map(a => a.name),
+      ...data.tags,
+    ];
+    list.innerHTML = "";
+    for (const v of values) {
+      const opt = document.createElement("option");
+      opt.value = v;
+      list.appendChild(opt);
+    }
+  } catch (e) {
+    list.innerHTML = "";
+  }
+}
+
 async function selectPaper(paperId, title) {
   selectedPaperId = paperId;
   selectedPaperTitle = title || "";
@@ -210,7 +251,7 @@ async function runDedup() {
   const threshold = raw ? Number(raw) : 0.85;
   setStatus($("dedupStatus"), "Running dedup report...");
   try {
-    const rows = await apiGet(`/dedup/report?threshold=${encodeURIComponent(threshold)}`);
+    const rows = await apiGetNdjson(`/dedup/report?threshold=${encodeURIComponent(threshold)}&max_results=1000`);
     const tbody = $("dedupTbody");
     tbody.innerHTML = "";
     for (const r of rows) {
@@ -235,6 +276,7 @@ document.addEventListener("DOMContentLoaded", () => {
   });
 
   $("searchBtn").addEventListener("click", searchPapers);
+  $("searchInput").addEventListener("input", scheduleSuggest);
   $("reloadPapersBtn").addEventListener("click", loadPapers);
 
   $("addTagBtn").addEventListener("click", addTag);
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import json
+from pathlib import Path
+from typing import List, Optional
+
 import typer
 
 from app.backend.export import (
@@ -8,7 +12,31 @@ from app.backend.export import (
     export_markdown,
     export_csv,
 )
-from app.backend.dedup import find_possible_duplicates
+from app.backend.db import DEFAULT_LIBRARY, init_db, list_libraries, set_library
+from app.backend.libraries import federated_search, open_library
+from app.backend.changes import wait_for_changes
+from app.backend.loadtest import DEFAULT_MIX, format_report, parse_mix, run_load_test
+from app.backend.backup import backup_db, restore_db
+from app.backend.maintenance import run_maintenance
+from app.backend.fts import ensure_fts
+from app.backend.search import combined_search, fts_search
+from app.backend.semantic import hybrid_search, semantic_search, update_vector_index
+from app.backend.related import related_papers, update_related_index
+from app.backend.identifiers import benchmark_identifiers
+from app.backend.hashing import find_identical_files, hash_files
+from app.backend.thumbnails import render_thumbnails
+from app.backend.importers import import_file
+from app.backend.ingest import ingest_pdfs
+from app.backend.dedup import (
+    iter_possible_duplicates,
+    update_dedup_index,
+    backfill_paper_keys,
+    find_exact_duplicates,
+    get_dedup_clusters,
+    list_dedup_clusters,
+    merge_papers,
+    merge_clusters,
+)
 from app.backend.projects import (
     create_project,
     list_projects,
@@ -25,32 +53,73 @@ from app.backend.tags_notes import (
 app = typer.Typer(help="Research Library Engine CLI")
 
 
+@app.callback()
+def main(
+    ctx: typer.Context,
+    library: str = typer.Option(
+        DEFAULT_LIBRARY,
+        "--library",
+        "-L",
+        envvar="RLE_LIBRARY",
+        help="Library database to use.",
+    ),
+):
+    """Select the library for this call."""
+    set_library(library)
+    if ctx.invoked_subcommand not in ("library-create", "libraries"):
+        open_library(library)
+
+
 # -------------------------------------------------------------------
 # Export commands
 # -------------------------------------------------------------------
 
 @app.command("export-bibtex")
-def cmd_export_bibtex():
-    """Export all papers as BibTeX."""
-    print(export_bibtex())
+def cmd_export_bibtex(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+):
+    """Export papers as BibTeX (optionally filtered)."""
+    print(export_bibtex(project_id, tag, year_from, year_to, query))
 
 
 @app.command("export-ieee")
-def cmd_export_ieee():
-    """Export all papers as IEEE-style references."""
-    print(export_ieee())
+def cmd_export_ieee(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+):
+    """Export papers as IEEE-style references (optionally filtered)."""
+    print(export_ieee(project_id, tag, year_from, year_to, query))
 
 
 @app.command("export-markdown")
-def cmd_export_markdown():
-    """Export all papers as Markdown."""
-    print(export_markdown())
+def cmd_export_markdown(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+):
+    """Export papers as Markdown (optionally filtered)."""
+    print(export_markdown(project_id, tag, year_from, year_to, query))
 
 
 @app.command("export-csv")
-def cmd_export_csv():
-    """Export all papers as CSV."""
-    print(export_csv())
+def cmd_export_csv(
+    project_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    year_from: Optional[int] = None,
+    year_to: Optional[int] = None,
+    query: Optional[str] = None,
+):
+    """Export papers as CSV (optionally filtered)."""
+    print(export_csv(project_id, tag, year_from, year_to, query))
 
 
 # -------------------------------------------------------------------
@@ -58,18 +127,369 @@ def cmd_export_csv():
 # -------------------------------------------------------------------
 
 @app.command("dedup-report")
-def cmd_dedup_report(threshold: float = 0.85):
-    """Show possible duplicate papers."""
-    results = find_possible_duplicates(threshold)
-    if not results:
+def cmd_dedup_report(
+    threshold: float = 0.85,
+    top_k: Optional[int] = None,
+    max_results: Optional[int] = None,
+    ndjson: bool = False,
+):
+    """Show possible duplicate papers (streamed, best first)."""
+    found = False
+    for r in iter_possible_duplicates(threshold, top_k, max_results):
+        found = True
+        if ndjson:
+            print(json.dumps(r))
+        else:
+            print(
+                f"{r['score']}: "
+                f"{r['paper_1_title']}  <->  {r['paper_2_title']}"
+            )
+
+    if not found and not ndjson:
         print("No possible duplicates found.")
+
+
+@app.command("dedup-clusters")
+def cmd_dedup_clusters(
+    threshold: float = 0.85,
+    limit: Optional[int] = None,
+    rebuild: bool = False,
+):
+    """Show groups of possible duplicates (one line per group member)."""
+    clusters = list_dedup_clusters(threshold, limit, rebuild)
+    if not clusters:
+        print("No duplicate clusters found.")
+        return
+
+    for c in clusters:
+        print(f"Cluster {c['cluster_id']} ({c['size']} papers)")
+        for p in c["papers"]:
+            marker = "*" if p["paper_id"] == c["representative_id"] else " "
+            print(f"  {marker} {p['paper_id']}  {p['title']}")
+
+
+@app.command("dedup-merge")
+def cmd_dedup_merge(
+    cluster_id: Optional[List[int]] = typer.Option(None, help="Cluster to merge (repeatable)."),
+    all_clusters: bool = False,
+    yes: bool = typer.Option(False, "--yes", help="Confirm the destructive merge."),
+):
+    """Merge dedup clusters into their representatives (destructive)."""
+    if not cluster_id and not all_clusters:
+        print("Nothing to merge: pass --cluster-id or --all-clusters.")
+        raise typer.Exit(code=1)
+
+    clusters = None
+    if not all_clusters:
+        clusters = get_dedup_clusters(cluster_id)
+        missing = set(cluster_id) - {c["cluster_id"] for c in clusters}
+        if missing:
+            print(f"Unknown cluster ids: {sorted(missing)} (clusters were rebuilt?)")
+            raise typer.Exit(code=1)
+
+        for c in clusters:
+            print(f"Cluster {c['cluster_id']} ({c['size']} papers)")
+            for p in c["papers"]:
+                marker = "*" if p["paper_id"] == c["representative_id"] else " "
+                print(f"  {marker} {p['paper_id']}  {p['title']}")
+
+    if not yes:
+        print("Merging deletes duplicate papers. Re-run with --yes to confirm.")
+        raise typer.Exit(code=1)
+
+    # Merge exactly what was shown: rejected if rebuilt in between
+    try:
+        stats = merge_clusters(clusters)
+    except ValueError as e:
+        print(f"Error: {e}")
+        raise typer.Exit(code=1)
+    print(f"Merged {stats['merged']} duplicate papers in {stats['seconds']} s.")
+
+
+@app.command("merge-papers")
+def cmd_merge_papers(
+    canonical_id: str,
+    duplicate_ids: List[str],
+    yes: bool = typer.Option(False, "--yes", help="Confirm the destructive merge."),
+):
+    """Merge duplicate papers into a canonical paper (destructive)."""
+    if not yes:
+        print("Merging deletes duplicate papers. Re-run with --yes to confirm.")
+        raise typer.Exit(code=1)
+
+    stats = merge_papers((canonical_id, d) for d in duplicate_ids)
+    print(f"Merged {stats['merged']} duplicate papers in {stats['seconds']} s.")
+
+
+@app.command("dedup-index")
+def cmd_dedup_index(min_score: float = 0.5):
+    """Score new or modified papers into the dedup candidate index."""
+    stats = update_dedup_index(min_score)
+    print(f"Scored {stats['scored']} papers, {stats['candidates']} candidate pairs.")
+
+
+@app.command("dedup-exact")
+def cmd_dedup_exact():
+    """Show papers sharing a title fingerprint or DOI."""
+    groups = find_exact_duplicates()
+    if not groups["fingerprint"] and not groups["doi"]:
+        print("No exact duplicates found.")
+        return
+
+    for kind, rows in groups.items():
+        for g in rows:
+            print(f"{kind} {g['key']} ({g['count']}): {', '.join(g['paper_ids'])}")
+
+
+# -------------------------------------------------------------------
+# Search
+# -------------------------------------------------------------------
+
+@app.command("search")
+def cmd_search(query: str, limit: int = 20, notes: bool = False, mode: Optional[str] = None):
+    """Full-text search (FTS5); --notes also ranks by note matches.
+
+    --mode semantic|hybrid uses the vector index (needs numpy).
+    """
+    if mode == "semantic":
+        results = semantic_search(query, limit)
+    elif mode == "hybrid":
+        results = hybrid_search(query, limit)
+    elif notes:
+        results = combined_search(query, limit)
+    else:
+        results = fts_search(query, limit)
+
+    if not results:
+        print("No results.")
+        return
+
+    if mode in ("semantic", "hybrid"):
+        for r in results:
+            print(f"{r['score']:.3f}  {r['id']}  {r['title']}")
         return
 
     for r in results:
-        print(
-            f"{r['score']}: "
-            f"{r['paper_1_title']}  <->  {r['paper_2_title']}"
-        )
+        marker = " [note]" if r.get("note_hit") else ""
+        print(f"{r['rank']:.3f}  {r['id']}  {r['title']}{marker}")
+
+
+@app.command("vector-index")
+def cmd_vector_index(rebuild: bool = False):
+    """Embed new/changed papers for semantic search (--rebuild to start over)."""
+    stats = update_vector_index(rebuild)
+    print(
+        f"Embedded {stats['embedded']} papers, removed {stats['removed']} "
+        f"({stats['papers']} in the vector index)."
+    )
+
+
+@app.command("search-all")
+def cmd_search_all(query: str, libraries: Optional[str] = None, limit: int = 20):
+    """FTS search across libraries (comma-separated --libraries, default all)."""
+    names = [n.strip() for n in libraries.split(",") if n.strip()] if libraries else None
+    found = federated_search(query, names, limit)
+    for name, error in found["errors"].items():
+        print(f"[{name}] error: {error}")
+
+    if not found["results"]:
+        print("No results.")
+        return
+
+    for r in found["results"]:
+        print(f"{r['rank']:.3f}  [{r['library']}]  {r['id']}  {r['title']}")
+
+
+@app.command("related")
+def cmd_related(paper_id: str, limit: int = 10):
+    """Papers related to a paper (shared authors, projects, tags, title terms)."""
+    results = related_papers(paper_id, limit)
+    if not results:
+        print("No related papers.")
+        return
+
+    for r in results:
+        print(f"{r['score']:.3f}  {r['id']}  {r['title']}")
+
+
+@app.command("related-index")
+def cmd_related_index(full: bool = False):
+    """Refresh precomputed related-paper lists (--full to recompute all)."""
+    stats = update_related_index(full)
+    print(
+        f"Refreshed {stats['refreshed']} papers "
+        f"({stats['neighbors_updated']} neighbor lists updated)."
+    )
+
+
+# -------------------------------------------------------------------
+# Ingest
+# -------------------------------------------------------------------
+
+@app.command("ingest")
+def cmd_ingest(path: Path, batch_size: int = 100, thumbnails: bool = True):
+    """Ingest a PDF, or a folder of PDFs recursively."""
+    paths = sorted(path.rglob("*.pdf")) if path.is_dir() else [path]
+    results = ingest_pdfs(paths, batch_size, thumbnails)
+    for r in results:
+        print(f"{r['paper_id']}  {r['title']}")
+    print(f"Ingested {len(results)} PDFs.")
+
+
+@app.command("thumbnails")
+def cmd_thumbnails(folder: Path, workers: Optional[int] = None):
+    """Pre-render first-page thumbnails for a folder of PDFs (skips existing ones)."""
+    paths = sorted(folder.rglob("*.pdf"))
+    hashes = hash_files(paths, workers)
+    rendered = render_thumbnails([(p, hashes[p]) for p in paths], workers)
+    failed = sum(1 for ok in rendered.values() if not ok)
+    print(f"{len(rendered) - failed} thumbnails ready, {failed} failed.")
+
+
+@app.command("identical-files")
+def cmd_identical_files(folder: Path, workers: Optional[int] = None):
+    """List byte-identical PDFs (size and pre-hash first, SHA-256 to confirm)."""
+    groups = find_identical_files(sorted(folder.rglob("*.pdf")), workers)
+    if not groups:
+        print("No identical files found.")
+        return
+
+    for group in groups:
+        print("  ==  ".join(str(p) for p in group))
+
+
+@app.command("bench-identifiers")
+def cmd_bench_identifiers(folder: Path):
+    """Benchmark DOI / arXiv / ISBN extraction over a folder of PDFs."""
+    paths = sorted(folder.rglob("*.pdf"))
+    stats = benchmark_identifiers(paths)
+    print(
+        f"{stats['pdfs']} PDFs in {stats['seconds']} s "
+        f"({stats['seconds_per_1k']} s per 1k PDFs, {stats['errors']} errors)"
+    )
+    print(f"DOI found by source: {stats['doi_by_source']}")
+
+
+@app.command("import")
+def cmd_import(path: Path, fmt: Optional[str] = None, batch_size: int = 10000):
+    """Bulk import a BibTeX / RIS / CSV file (format from suffix unless --fmt)."""
+    stats = import_file(path, fmt, batch_size)
+    print(
+        f"Imported {stats['imported']} papers from {stats['format']} "
+        f"({stats['skipped_doi']} skipped as existing DOIs) in {stats['seconds']} s."
+    )
+
+
+# -------------------------------------------------------------------
+# Database
+# -------------------------------------------------------------------
+
+@app.command("load-test")
+def cmd_load_test(
+    clients: int = 16,
+    duration: float = 30.0,
+    requests: Optional[int] = typer.Option(None, help="Stop each client after N calls."),
+    mix: str = typer.Option(
+        ",".join(f"{op}={w}" for op, w in DEFAULT_MIX.items()),
+        help="Weighted operation mix (search, papers, tag, export, ingest).",
+    ),
+    pdf_dir: Optional[Path] = typer.Option(None, help="PDFs for the ingest share."),
+    seed_papers: int = 2000,
+    as_json: bool = typer.Option(False, "--json", help="Print the raw report as JSON."),
+):
+    """Load-test a local server with concurrent clients (uses the 'loadtest' library)."""
+    stats = run_load_test(
+        clients=clients,
+        duration=duration,
+        requests_per_client=requests,
+        mix=parse_mix(mix),
+        pdf_dir=pdf_dir,
+        seed_papers=seed_papers,
+    )
+    print(json.dumps(stats, indent=2) if as_json else format_report(stats))
+
+
+@app.command("changes")
+def cmd_changes(since: int = 0, limit: int = 1000, wait: float = 0.0):
+    """Print change-feed entries after --since as JSON lines (--wait to long-poll)."""
+    page = wait_for_changes(since, limit, wait)
+    for c in page["changes"]:
+        print(json.dumps(c, default=str))
+    print(f"# next={page['next']} more={str(page['more']).lower()}")
+
+
+@app.command("libraries")
+def cmd_libraries():
+    """List library databases."""
+    for name in list_libraries():
+        print(name)
+
+
+@app.command("library-create")
+def cmd_library_create(name: str):
+    """Create a new, empty library database."""
+    open_library(name, create=True)
+    print(f"Library ready: {name}")
+
+
+@app.command("db-migrate")
+def cmd_db_migrate():
+    """Apply schema migrations and backfill persisted dedup keys."""
+    init_db()
+    ensure_fts()
+    updated = backfill_paper_keys()
+    print(f"Backfilled dedup keys for {updated} papers.")
+
+
+@app.command("db-maintain")
+def cmd_db_maintain(
+    full: bool = typer.Option(False, help="FTS optimize + ANALYZE instead of merge steps."),
+    vacuum: bool = typer.Option(False, help="Full VACUUM (enables incremental vacuum)."),
+):
+    """Optimize FTS indexes, refresh statistics and reclaim free pages."""
+    stats = run_maintenance(full=full, vacuum=vacuum)
+    before, after = stats["before"], stats["after"]
+
+    for step in stats["steps"]:
+        print(f"- {step}")
+    for table, n in before["fts_segments"].items():
+        print(f"{table} segments: {n} -> {after['fts_segments'][table]}")
+    print(f"free pages: {before['freelist_pages']} -> {after['freelist_pages']}")
+    for probe, ms in before["latency_ms"].items():
+        print(f"{probe}: {ms} ms -> {after['latency_ms'][probe]} ms")
+    print(f"Done in {stats['seconds']} s.")
+
+
+@app.command("backup")
+def cmd_backup(
+    dest: Path,
+    compact: bool = typer.Option(False, help="Use VACUUM INTO (compacted copy)."),
+):
+    """Snapshot the live database (online backup API) with a checksum manifest."""
+    stats = backup_db(dest, compact=compact)
+    print(
+        f"Backed up {stats['size_bytes']} bytes to {stats['path']} "
+        f"in {stats['seconds']} s ({stats['mb_per_s']} MB/s, {stats['mode']})."
+    )
+    print(f"sha256 {stats['sha256']}")
+
+
+@app.command("restore")
+def cmd_restore(
+    src: Path,
+    verify: bool = typer.Option(True, help="Check the manifest checksum first."),
+    yes: bool = typer.Option(False, "--yes", help="Confirm overwriting the library."),
+):
+    """Replace the library database with a backup (stop the server first)."""
+    if not yes:
+        print("Restoring overwrites the current library. Re-run with --yes to confirm.")
+        raise typer.Exit(code=1)
+
+    stats = restore_db(src, verify=verify)
+    print(
+        f"Restored {stats['size_bytes']} bytes into {stats['path']} "
+        f"in {stats['seconds']} s ({stats['mb_per_s']} MB/s)."
+    )
 
 
 # -------------------------------------------------------------------
@@ -0,0 +1,30 @@
+import shutil
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.backend.main import app
+from app.backend.db import library_dir, library_engine, use_library
+from app.backend.libraries import open_library
+
+
+@pytest.fixture
+def library():
+    """
+    A scratch library, selected for the test and removed afterwards.
+    """
+    name = f"test-{uuid4().hex[:12]}"
+    open_library(name, create=True)
+    with use_library(name):
+        yield name
+    library_engine(name).dispose()
+    shutil.rmtree(library_dir(name), ignore_errors=True)
+
+
+@pytest.fixture
+def client(library):
+    """
+    API client routed to the scratch library.
+    """
+    return TestClient(app, headers={"X-Library": library})
@@ -0,0 +1,59 @@
+import sqlite3
+import threading
+
+from app.backend.backup import backup_db, verify_backup
+
+
+def _make_source(path, rows=20000):
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.executemany("INSERT INTO t(body) VALUES (?)", (("x" * 1000,) for _ in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def test_backup_completes_while_source_is_written(tmp_path):
+    source = tmp_path / "db.sqlite"
+    _make_source(source)
+
+    done = threading.Event()
+    writes = []
+
+    def writer():
+        conn = sqlite3.connect(str(source), timeout=30)
+        while not done.is_set():
+            conn.execute("INSERT INTO t(body) VALUES (?)", ("y" * 1000,))
+            conn.commit()
+            writes.append(1)
+        conn.close()
+
+    result = {}
+
+    def backup():
+        result.update(backup_db(tmp_path / "backup.sqlite", source=source))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        while not writes:
+            pass
+        worker = threading.Thread(target=backup)
+        worker.start()
+        worker.join(timeout=30)
+        # A backup restarted by every write never finishes
+        assert not worker.is_alive()
+    finally:
+        done.set()
+        thread.join()
+
+    stats = result
+    assert stats["mode"] == "online_backup"
+    assert verify_backup(tmp_path / "backup.sqlite") is True
+
+    copy = sqlite3.connect(stats["path"])
+    try:
+        assert copy.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        copied = copy.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+    finally:
+        copy.close()
+    assert 20000 < copied <= 20000 + len(writes)
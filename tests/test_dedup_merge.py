@@ -0,0 +1,47 @@
+from app.backend.importers.bulk import import_records
+
+
+RECORDS = [
+    {
+        "title": "Radar beamforming with phased arrays",
+        "year": 2020,
+        "authors": ["A. One", "B. Two"],
+        "doi": "10.1/a",
+    },
+    {
+        "title": "Radar beamforming with phased arrays.",
+        "year": 2020,
+        "authors": ["A. One"],
+    },
+    {
+        "title": "Sparse MIMO radar",
+        "year": 2021,
+        "authors": ["C. Three"],
+    },
+]
+
+
+def test_merge_accepts_listed_clusters(client):
+    import_records(RECORDS)
+
+    listed = client.get("/dedup/clusters", params={"threshold": 0.8}).json()
+    assert [c["size"] for c in listed] == [2]
+
+    r = client.post("/dedup/merge", json={"clusters": listed})
+    assert r.status_code == 200, r.text
+    assert r.json()["merged"] == 1
+
+    titles = sorted(p["title"] for p in client.get("/papers").json())
+    assert titles == ["Radar beamforming with phased arrays", "Sparse MIMO radar"]
+    assert client.get("/dedup/clusters", params={"threshold": 0.8}).json() == []
+
+
+def test_merge_rejects_changed_cluster(client):
+    import_records(RECORDS)
+
+    listed = client.get("/dedup/clusters", params={"threshold": 0.8}).json()
+    listed[0]["papers"] = listed[0]["papers"][:1]
+
+    r = client.post("/dedup/merge", json={"clusters": listed})
+    assert r.status_code == 400
+    assert len(client.get("/papers").json()) == 3
@@ -0,0 +1,49 @@
+from sqlmodel import text
+
+from app.backend.db import engine
+from app.backend.importers.bulk import import_records
+from app.backend.related import related_papers, update_related_index
+from app.backend.tags_notes import add_tag_to_paper
+
+
+def _ids(paper_id):
+    return [r["id"] for r in related_papers(paper_id)]
+
+
+def _paper_id(title):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT id FROM paper WHERE title = :t"), {"t": title}).scalar()
+
+
+def test_late_commit_is_not_skipped(library):
+    import_records([{"title": "Sparse MIMO radar", "authors": ["A. One"]}])
+    first = _paper_id("Sparse MIMO radar")
+
+    # A writer that stamped its paper before the last refresh but
+    # committed after it
+    import_records([{"title": "Radar imaging", "authors": ["A. One"]}])
+    late = _paper_id("Radar imaging")
+    with engine.connect() as conn:
+        conn.execute(
+            text("UPDATE paper SET updated_at = '2000-01-01 00:00:00' WHERE id = :id"),
+            {"id": late},
+        )
+        conn.execute(text("UPDATE relatedstate SET processed_seq = 1"))
+        conn.execute(text("DELETE FROM paperneighbor"))
+        conn.commit()
+
+    update_related_index()
+    assert _ids(late) == [first]
+    assert _ids(first) == [late]
+
+
+def test_tags_refresh_lists(library):
+    import_records([{"title": "Sparse MIMO radar"}, {"title": "Graph neural networks"}])
+    radar, graphs = _paper_id("Sparse MIMO radar"), _paper_id("Graph neural networks")
+    assert _ids(radar) == []
+
+    add_tag_to_paper(radar, "reading")
+    add_tag_to_paper(graphs, "reading")
+    assert update_related_index()["refreshed"] == 2
+    assert _ids(radar) == [graphs]
+    assert update_related_index()["refreshed"] == 0
@@ -0,0 +1,35 @@
+from app.backend.importers.bulk import import_records
+from app.backend.suggest import suggest
+from app.backend.tags_notes import set_note_for_paper
+
+
+def _titles(prefix):
+    return [t["title"] for t in suggest(prefix)["titles"]]
+
+
+def test_suggest_checks_long_and_short_prefixes(library):
+    import_records([
+        {"title": "Networked radar arrays"},
+        {"title": "Network coding for radar"},
+        {"title": "Neural radar imaging"},
+    ])
+
+    assert _titles("networke") == ["Networked radar arrays"]
+    assert _titles("coding r") == ["Network coding for radar"]
+    assert _titles("ne") == [
+        "Neural radar imaging",
+        "Networked radar arrays",
+        "Network coding for radar",
+    ]
+    assert _titles("n") == []
+
+
+def test_suggest_cache_follows_title_changes(library):
+    import_records([{"title": "Sparse MIMO radar"}])
+    assert _titles("spa") == ["Sparse MIMO radar"]
+
+    paper_id = suggest("spa")["titles"][0]["id"]
+    set_note_for_paper(paper_id, "notes do not change suggestions")
+    import_records([{"title": "Sparse arrays"}])
+
+    assert _titles("spa") == ["Sparse arrays", "Sparse MIMO radar"]